@@ -25,7 +25,7 @@ import time
 import winreg
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 
 # Windows DPAPI for cookie decryption
@@ -1015,31 +1015,41 @@ class CookieManager:
                 return False
 
             with open(file_path, encoding="utf-8") as f:
-                cookies = f.read()
+                return self._import_cookie_stream(f, file_path, domain)
 
-            if not cookies or len(cookies.strip()) < 50:
-                self.logger.log_error(f"Cookie file is empty or too small: {file_path}")
-                return False
+        except Exception as e:
+            self.logger.log_error(f"Failed to import cookie file {file_path}: {e}")
+            return False
 
-            # Validate cookie content
-            if not self._validate_cookie_content(cookies, domain):
-                self.logger.log_error(f"Cookie file validation failed: {file_path}")
-                return False
+    def _import_cookie_stream(
+        self, stream: TextIO, file_path: str, domain: str = "youtube.com"
+    ) -> bool:
+        """Validate and cache cookies read from an open text stream.
 
-            # Cache the imported cookies
-            cache_key = f"{domain}_manual"
-            self.cookie_cache[cache_key] = cookies
-            self.last_extraction_time[cache_key] = time.time()
+        file_path is only recorded as the manual cookie file and used in log
+        messages; the cookie text itself comes from stream.
+        """
+        cookies = stream.read()
 
-            with self.lock:
-                self._manual_cookie_file_path = file_path
-            self.logger.log_info(f"Successfully imported cookies from {file_path}")
-            return True
+        if not cookies or len(cookies.strip()) < 50:
+            self.logger.log_error(f"Cookie file is empty or too small: {file_path}")
+            return False
 
-        except Exception as e:
-            self.logger.log_error(f"Failed to import cookie file {file_path}: {e}")
+        # Validate cookie content
+        if not self._validate_cookie_content(cookies, domain):
+            self.logger.log_error(f"Cookie file validation failed: {file_path}")
             return False
 
+        # Cache the imported cookies
+        cache_key = f"{domain}_manual"
+        self.cookie_cache[cache_key] = cookies
+        self.last_extraction_time[cache_key] = time.time()
+
+        with self.lock:
+            self._manual_cookie_file_path = file_path
+        self.logger.log_info(f"Successfully imported cookies from {file_path}")
+        return True
+
     def refresh_browser_detection(self):
         """Refresh Chrome detection."""
         self.logger.log_info("Refreshing Chrome detection...")
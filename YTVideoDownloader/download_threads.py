@@ -6,6 +6,7 @@ This module contains the DownloadThread and PlaylistDownloadThread classes
 that handle video and playlist downloads using threading and queue communication.
 """
 
+import copy
 import os
 import threading
 import time
@@ -16,7 +17,11 @@ from app_logger import AppLogger
 from cookie_manager import get_cookie_manager
 
 # Import utility functions
-from utils import check_ffmpeg, get_bundled_ffmpeg_path
+from utils import (
+    check_ffmpeg,
+    cookie_file_diagnostics,
+    get_bundled_ffmpeg_path,
+)
 
 
 class _SuppressLogger:
@@ -43,6 +48,17 @@ class _SuppressLogger:
         pass
 
 
+def _build_format_string(video_format_id, audio_format_id, format_id):
+    """Build the yt-dlp format string for a download.
+
+    A manual selection of both a video and an audio format is merged as
+    "video+audio"; otherwise the automatic format_id is used as-is.
+    """
+    if video_format_id and audio_format_id:
+        return f"{video_format_id}+{audio_format_id}"
+    return format_id
+
+
 class DownloadThread:
     """Thread for downloading individual videos using CustomTkinter threading"""
 
@@ -54,6 +70,8 @@ class DownloadThread:
         update_queue,
         video_format_id=None,
         audio_format_id=None,
+        ratelimit=None,
+        preloaded_info=None,
     ):
         self.url = url
         self.format_id = format_id
@@ -61,6 +79,10 @@ class DownloadThread:
         self.update_queue = update_queue
         self.video_format_id = video_format_id
         self.audio_format_id = audio_format_id
+        self.ratelimit = ratelimit  # Max download rate in bytes/s (None = unlimited)
+        # Info dict from an earlier extract_info(url, download=False); reused
+        # instead of extracting the video again
+        self.preloaded_info = preloaded_info
         self.logger = AppLogger.get_instance()
         self.correlation_id = None
         self.download_start_time = None
@@ -68,12 +90,21 @@ class DownloadThread:
         self.cancelled = False
         self.thread = None
         self._lock = threading.Lock()  # Thread safety for state changes
+        self._done = threading.Event()  # Set when run() returns, however it ends
 
     def start(self):
         """Start download in background thread"""
         self.thread = threading.Thread(target=self.run, daemon=True)
         self.thread.start()
 
+    def wait_done(self, timeout=None):
+        """Block until run() has returned or timeout expires.
+
+        Returns True if the worker finished (including after a cancel),
+        False on timeout.
+        """
+        return self._done.wait(timeout)
+
     def run(self):
         """Run download in background thread"""
         try:
@@ -85,11 +116,13 @@ class DownloadThread:
             self.update_queue.put({"type": "status", "text": "Starting download..."})
 
             # Determine format selection mode
-            if self.video_format_id and self.audio_format_id:
-                format_id = f"{self.video_format_id}+{self.audio_format_id}"
+            manual_selected = bool(self.video_format_id and self.audio_format_id)
+            format_id = _build_format_string(
+                self.video_format_id, self.audio_format_id, self.format_id
+            )
+            if manual_selected:
                 is_merging = True
             else:
-                format_id = self.format_id
                 is_merging = "+" in self.format_id and self.format_id not in [
                     "bestvideo",
                     "bestaudio",
@@ -108,7 +141,6 @@ class DownloadThread:
                 is_merging = False
 
             # Create fallback sequence
-            manual_selected = bool(self.video_format_id and self.audio_format_id)
             if manual_selected:
                 format_attempts = [format_id]
             else:
@@ -137,7 +169,7 @@ class DownloadThread:
                         self.output_path, "%(title)s [%(format_id)s].%(ext)s"
                     )
                     unique_template, expected_filename = self._generate_unique_filename(
-                        base_template
+                        base_template, attempt_format
                     )
 
                     ydl_opts = {
@@ -149,6 +181,8 @@ class DownloadThread:
                         "quiet": True,
                         "logger": _SuppressLogger(),
                     }
+                    if self.ratelimit:
+                        ydl_opts["ratelimit"] = self.ratelimit
 
                     # Add FFmpeg location if available
                     bundled_path = get_bundled_ffmpeg_path()
@@ -213,33 +247,9 @@ class DownloadThread:
                                     ydl_opts["cookiefile"] = cookie_path
                                     # Diagnostics: confirm file exists and key presence
                                     try:
-                                        exists = os.path.exists(cookie_path)
-                                        size = (
-                                            os.path.getsize(cookie_path)
-                                            if exists
-                                            else 0
+                                        exists, size, present_keys = (
+                                            cookie_file_diagnostics(cookie_path)
                                         )
-                                        present_keys = []
-                                        if exists:
-                                            with open(
-                                                cookie_path,
-                                                encoding="utf-8",
-                                                errors="ignore",
-                                            ) as cf:
-                                                text = cf.read()
-                                            for key in [
-                                                "__Secure-3PAPISID",
-                                                "__Secure-3PSID",
-                                                "SAPISID",
-                                                "APISID",
-                                                "SID",
-                                                "HSID",
-                                                "SSID",
-                                                "VISITOR_INFO1_LIVE",
-                                                "CONSENT",
-                                            ]:
-                                                if key in text:
-                                                    present_keys.append(key)
                                         self.logger.log_info(
                                             f"Using cookie file: {cookie_path} (exists={exists}, size={size} bytes, keys={present_keys})"
                                         )
@@ -259,7 +269,13 @@ class DownloadThread:
 
                     # Perform download
                     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([self.url])
+                        if self.preloaded_info:
+                            # process_ie_result mutates the info dict it is given
+                            ydl.process_ie_result(
+                                copy.deepcopy(self.preloaded_info), download=True
+                            )
+                        else:
+                            ydl.download([self.url])
 
                         # Verify the download by locating the produced file
                         if expected_filename and os.path.exists(expected_filename):
@@ -337,6 +353,8 @@ class DownloadThread:
             self.update_queue.put(
                 {"type": "error", "text": f"Download error: {str(e)}"}
             )
+        finally:
+            self._done.set()
 
     def progress_hook(self, d):
         """Progress hook for yt-dlp"""
@@ -399,9 +417,14 @@ class DownloadThread:
             self.cancelled = True
             self.logger.log_info(f"Download cancelled for URL: {self.url}")
 
-    def _generate_unique_filename(self, base_template):
+    def _generate_unique_filename(self, base_template, format_spec=None):
         """Generate unique filename by adding incremental suffix if file exists
 
+        Args:
+            base_template: The yt-dlp output template for the download
+            format_spec: Format the download will request, so the predicted
+                %(format_id)s matches the file yt-dlp actually writes
+
         Returns:
             tuple: (template, expected_filename) where template is the yt-dlp template
                    and expected_filename is the actual file path that will be created
@@ -415,9 +438,18 @@ class DownloadThread:
                 "outtmpl": base_template,
                 "simulate": True,  # Don't actually download
             }
+            if format_spec:
+                temp_ydl_opts["format"] = format_spec
 
             with yt_dlp.YoutubeDL(temp_ydl_opts) as ydl:
-                info = ydl.extract_info(self.url, download=False)
+                if self.preloaded_info:
+                    # Run format selection on a copy so %(format_id)s reflects
+                    # format_spec; the raw info dict has no selected format
+                    info = ydl.process_ie_result(
+                        copy.deepcopy(self.preloaded_info), download=False
+                    )
+                else:
+                    info = ydl.extract_info(self.url, download=False)
                 if info:
                     # Get the filename that would be used
                     original_filename = ydl.prepare_filename(info)
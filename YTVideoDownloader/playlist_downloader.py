@@ -6,6 +6,7 @@ This module provides completely independent playlist download functionality,
 separated from single video downloads with zero shared dependencies.
 """
 
+import copy
 import os
 import re
 import threading
@@ -52,6 +53,7 @@ class PlaylistVideoDownloader:
         total_videos: int,
         video_format_id: str | None = None,
         audio_format_id: str | None = None,
+        preloaded_info: dict[str, Any] | None = None,
     ):
         """Initialize playlist video downloader.
 
@@ -64,6 +66,8 @@ class PlaylistVideoDownloader:
             total_videos: Total number of videos in playlist
             video_format_id: Specific video format ID (for manual selection)
             audio_format_id: Specific audio format ID (for manual selection)
+            preloaded_info: Info dict from an earlier extract_info(url, download=False),
+                reused instead of extracting the video again
         """
         self.url = url
         self.format_id = format_id
@@ -73,6 +77,7 @@ class PlaylistVideoDownloader:
         self.total_videos = total_videos
         self.video_format_id = video_format_id
         self.audio_format_id = audio_format_id
+        self.preloaded_info = preloaded_info
 
         # Independent logging for playlist videos
         self.logger = AppLogger.get_instance()
@@ -190,7 +195,13 @@ class PlaylistVideoDownloader:
 
                     # Perform playlist video download
                     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([self.url])
+                        if self.preloaded_info:
+                            # process_ie_result mutates the info dict it is given
+                            ydl.process_ie_result(
+                                copy.deepcopy(self.preloaded_info), download=True
+                            )
+                        else:
+                            ydl.download([self.url])
 
                         # Verify the download was successful
                         if expected_filename and os.path.exists(expected_filename):
@@ -303,17 +314,19 @@ class PlaylistVideoDownloader:
 
         # Try to predict the expected filename
         try:
-            with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True}) as ydl:
-                info = ydl.extract_info(self.url, download=False)
-                if info:
-                    title = info.get("title", "video")
-                    # Clean title for filename
-                    clean_title = re.sub(r'[<>:"/\\|?*]', "_", title)
-                    expected_filename = os.path.join(
-                        self.output_path,
-                        f"{clean_title}_pv_{self.video_index}_{timestamp} [{self.format_id}].mp4",
-                    )
-                    return unique_template, expected_filename
+            info = self.preloaded_info
+            if not info:
+                with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True}) as ydl:
+                    info = ydl.extract_info(self.url, download=False)
+            if info:
+                title = info.get("title", "video")
+                # Clean title for filename
+                clean_title = re.sub(r'[<>:"/\\|?*]', "_", title)
+                expected_filename = os.path.join(
+                    self.output_path,
+                    f"{clean_title}_pv_{self.video_index}_{timestamp} [{self.format_id}].mp4",
+                )
+                return unique_template, expected_filename
         except Exception:
             pass
 
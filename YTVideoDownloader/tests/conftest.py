@@ -1,141 +1,319 @@
-from unittest.mock import Mock, patch
+import os
+import queue
+import tempfile
+import threading
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
 
-# If the system's Tcl/Tk is not available (headless or broken install), we
-# replace CustomTkinter widget classes with lightweight stubs so that
-# importing `gui.main_window` will not attempt to create a real Tk root.
-try:
-    import tkinter as _tk
+# Netscape cookie export used by the real-download (E2E/format) test modules
+COOKIE_FILE = Path(__file__).parent.parent / "youtube.com_cookies.txt"
+COOKIE_FILE_STR = str(COOKIE_FILE)
 
-    try:
-        # Try to create and destroy a root window to detect a working Tcl/Tk
-        root = _tk.Tk()
-        root.destroy()
-        _have_tk = True
-    except Exception:
-        _have_tk = False
-except Exception:
-    _have_tk = False
 
-if not _have_tk:
+# Immutable attribute defaults set by the headless VideoDownloaderApp.__init__
+_LIGHT_INIT_DEFAULTS = {
+    "_destroyed": False,
+    "playlist_info": None,
+    "current_video_url": None,
+    "current_video_info": None,
+    "single_video_downloader": None,
+    "playlist_downloader": None,
+    "cookie_operation_in_progress": False,
+}
+
+
+def _install_headless_gui_stubs():
+    """Install headless GUI stubs when Tcl/Tk is unusable.
+
+    If the system's Tcl/Tk is not available (headless or broken install), we
+    replace CustomTkinter widget classes with lightweight stubs so that
+    importing `gui.main_window` will not attempt to create a real Tk root.
+    """
     try:
-        import customtkinter as _ctk
-
-        class _CTKStub:
-            def __init__(self, *args, **kwargs):
-                # store attributes if tests want to inspect
-                pass
-
-            def configure(self, *args, **kwargs):
-                return None
-
-            def set(self, *args, **kwargs):
-                return None
-
-            def get(self, *args, **kwargs):
-                return ""
-
-            def grid(self, *args, **kwargs):
-                return None
-
-            def grid_remove(self, *args, **kwargs):
-                return None
-
-            def after(self, *args, **kwargs):
-                return None
-
-            def destroy(self, *args, **kwargs):
-                return None
-
-        # Replace common widget classes with the stub so class bases bind to them
-        for _name in (
-            "CTk",
-            "CTkFrame",
-            "CTkTabview",
-            "CTkLabel",
-            "CTkEntry",
-            "CTkButton",
-            "CTkCheckBox",
-            "CTkComboBox",
-            "CTkProgressBar",
-        ):
-            try:
-                setattr(_ctk, _name, _CTKStub)
-            except Exception:
-                pass
+        import tkinter as _tk
+
+        try:
+            # Try to create and destroy a root window to detect a working Tcl/Tk
+            root = _tk.Tk()
+            root.destroy()
+            _have_tk = True
+        except Exception:
+            _have_tk = False
     except Exception:
-        # If customtkinter is not available at import-time, don't crash here;
-        # the tests will handle it or raise later when importing GUI modules.
-        pass
-
-    # If Tcl/Tk is unavailable, ensure VideoDownloaderApp.__init__ won't try
-    # to create a real CTk root. Replace the constructor with a lightweight
-    # initializer that mirrors the important attributes without initializing
-    # tkinter internals. This helps tests that import the class at module
-    # import time (so base classes may be bound) but still want to create
-    # instances in a headless environment.
-    try:
-        import queue as _queue
-        from unittest.mock import Mock as _Mock
+        _have_tk = False
 
-        import gui.main_window as _gw
+    if not _have_tk:
+        try:
+            import customtkinter as _ctk
+
+            class _CTKStub:
+                __slots__ = ()
+
+                def __init__(self, *args, **kwargs):
+                    # stateless stub; widget subclasses still get a __dict__
+                    pass
+
+                def configure(self, *args, **kwargs):
+                    return None
+
+                def set(self, *args, **kwargs):
+                    return None
+
+                def get(self, *args, **kwargs):
+                    return ""
+
+                def grid(self, *args, **kwargs):
+                    return None
+
+                def grid_remove(self, *args, **kwargs):
+                    return None
+
+                def after(self, *args, **kwargs):
+                    return None
+
+                def destroy(self, *args, **kwargs):
+                    return None
+
+            # Replace common widget classes with the stub so class bases bind to them
+            vars(_ctk).update(
+                dict.fromkeys(
+                    (
+                        "CTk",
+                        "CTkFrame",
+                        "CTkTabview",
+                        "CTkLabel",
+                        "CTkEntry",
+                        "CTkButton",
+                        "CTkCheckBox",
+                        "CTkComboBox",
+                        "CTkProgressBar",
+                    ),
+                    _CTKStub,
+                )
+            )
+        except Exception:
+            # If customtkinter is not available at import-time, don't crash here;
+            # the tests will handle it or raise later when importing GUI modules.
+            pass
+
+        # If Tcl/Tk is unavailable, ensure VideoDownloaderApp.__init__ won't try
+        # to create a real CTk root. Replace the constructor with a lightweight
+        # initializer that mirrors the important attributes without initializing
+        # tkinter internals. This helps tests that import the class at module
+        # import time (so base classes may be bound) but still want to create
+        # instances in a headless environment.
+        try:
+            import queue as _queue
+            from unittest.mock import Mock as _Mock
 
-        cls = getattr(_gw, "VideoDownloaderApp", None)
-        if cls is not None:
+            import gui.main_window as _gw
 
-            def _light_init(self, *args, **kwargs):
-                # minimal attributes expected by tests
-                try:
-                    from app_logger import AppLogger as _AppLogger
+            cls = getattr(_gw, "VideoDownloaderApp", None)
+            if cls is not None:
 
-                    self.logger = _AppLogger.get_instance()
-                except Exception:
-                    self.logger = _Mock()
-
-                self._destroyed = False
-                self.formats = []
-                self.video_formats = []
-                self.audio_formats = []
-                self.format_id_map = {}
-                self.video_format_id_map = {}
-                self.audio_format_id_map = {}
-                self.playlist_info = None
-                self.current_video_url = None
-                self.current_video_info = None
-                self.single_video_downloader = None
-                self.playlist_downloader = None
-
-                # Try to obtain cookie manager if available
-                try:
-                    from cookie_manager import get_cookie_manager as _gcm
+                def _light_init(self, *args, **kwargs):
+                    # minimal attributes expected by tests
+                    try:
+                        from app_logger import AppLogger as _AppLogger
 
+                        self.logger = _AppLogger.get_instance()
+                    except Exception:
+                        self.logger = _Mock()
+
+                    # Immutable defaults go in with one dict update; containers
+                    # are created per instance so tests never share state
+                    self.__dict__.update(
+                        _LIGHT_INIT_DEFAULTS,
+                        formats=[],
+                        video_formats=[],
+                        audio_formats=[],
+                        format_id_map={},
+                        video_format_id_map={},
+                        audio_format_id_map={},
+                    )
+
+                    # Try to obtain cookie manager if available
                     try:
-                        self.cookie_manager = _gcm()
+                        from cookie_manager import get_cookie_manager as _gcm
+
+                        try:
+                            self.cookie_manager = _gcm()
+                        except Exception:
+                            self.cookie_manager = None
                     except Exception:
                         self.cookie_manager = None
+
+                    # Lightweight queue and common GUI placeholders
+                    self.__dict__.update(
+                        update_queue=_queue.Queue(),
+                        cookie_status_var=_Mock(),
+                        cookie_status_label=_Mock(),
+                        refresh_cookies_btn=_Mock(),
+                        import_cookies_btn=_Mock(),
+                        browser_refresh_btn=_Mock(),
+                        browser_combo=_Mock(),
+                        after=_Mock(),
+                    )
+
+                # Replace the constructor
+                try:
+                    cls.__init__ = _light_init
                 except Exception:
-                    self.cookie_manager = None
-
-                # Lightweight queue and common GUI placeholders
-                self.update_queue = _queue.Queue()
-                self.cookie_status_var = _Mock()
-                self.cookie_status_label = _Mock()
-                self.refresh_cookies_btn = _Mock()
-                self.import_cookies_btn = _Mock()
-                self.browser_refresh_btn = _Mock()
-                self.browser_combo = _Mock()
-                self.cookie_operation_in_progress = False
-                self.after = _Mock()
-
-            # Replace the constructor
-            try:
-                cls.__init__ = _light_init
-            except Exception:
-                pass
-    except Exception:
-        pass
+                    pass
+        except Exception:
+            pass
+
+
+# Runs at conftest import, before test modules are collected, so GUI classes
+# bind to the stubs. Deferring it saves nothing: the autouse patch_loggers
+# fixture imports gui.main_window for every test anyway.
+_install_headless_gui_stubs()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-network",
+        action="store_true",
+        default=False,
+        help="run tests marked 'network' that hit YouTube",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked 'network' unless --run-network was given."""
+    if config.getoption("--run-network"):
+        return
+    skip_network = pytest.mark.skip(reason="needs --run-network")
+    for item in items:
+        # get_closest_marker, not item.keywords: keywords also holds
+        # parametrize ids, and a mocked case may be named "network"
+        if item.get_closest_marker("network") is not None:
+            item.add_marker(skip_network)
+
+
+@pytest.fixture(scope="session")
+def temp_dir(tmp_path_factory):
+    """Provide an output directory shared by the session
+
+    Used by the mocked download tests: yt-dlp never runs there, so nothing
+    is written and one pytest-managed directory is enough.
+    """
+    return str(tmp_path_factory.mktemp("downloads"))
+
+
+@pytest.fixture
+def update_queue():
+    """Provide a fresh update queue (per test, since tests drain it)
+
+    The mocked download tests only put() and get(), so SimpleQueue's
+    C implementation is enough.
+    """
+    return queue.SimpleQueue()
+
+
+@pytest.fixture(scope="session")
+def sample_video_urls():
+    """Provide sample video URLs"""
+    return (
+        "https://www.youtube.com/watch?v=video1",
+        "https://www.youtube.com/watch?v=video2",
+        "https://www.youtube.com/watch?v=video3",
+    )
+
+
+@pytest.fixture(scope="session")
+def download_threads_module():
+    """Import download_threads (and with it yt_dlp) once per worker.
+
+    Session-scoped so the import cost lands in fixture setup rather than
+    in the first test that needs it. Not autouse, so GUI-only tests do not
+    pay for it.
+    """
+    import download_threads
+
+    return download_threads
+
+
+@pytest.fixture(scope="session")
+def download_thread_cls(download_threads_module):
+    """Provide the DownloadThread class from the session-imported module"""
+    return download_threads_module.DownloadThread
+
+
+# YoutubeDL stand-ins built once and reset per test by patched_ydl;
+# MagicMock provides the context-manager protocol for the class template
+_YDL_TEMPLATE = MagicMock()
+_YDL_INSTANCE = Mock()
+_YDL_TEMPLATE.return_value.__enter__.return_value = _YDL_INSTANCE
+_YDL_TEMPLATE.return_value.__exit__.return_value = None
+
+
+@pytest.fixture
+def patched_ydl(download_threads_module):
+    """Patch yt_dlp.YoutubeDL as seen by download_threads.
+
+    Yields (mock_class, mock_ydl) where mock_ydl is what
+    `with YoutubeDL(...) as ydl` binds, so tests only need to set
+    return values or side effects on it. Both are shared templates that
+    are reset here, so nothing a test configures leaks into the next one.
+    """
+    _YDL_TEMPLATE.reset_mock()
+    _YDL_INSTANCE.reset_mock(return_value=True, side_effect=True)
+    with patch.object(download_threads_module.yt_dlp, "YoutubeDL", _YDL_TEMPLATE):
+        yield _YDL_TEMPLATE, _YDL_INSTANCE
+
+
+class FakeYoutubeDL:
+    """Plain-object yt_dlp.YoutubeDL stand-in for tests that need no Mock.
+
+    The instance replaces the class itself: calling it records the options
+    and returns self, which then acts as its own context manager. Set
+    on_download to a callable to create files or raise during download().
+    """
+
+    def __init__(self):
+        self.opts = []
+        self.downloads = []
+        self.on_download = None
+
+    def __call__(self, opts=None):
+        self.opts.append(opts)
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+    def download(self, url_list):
+        self.downloads.append(list(url_list))
+        if self.on_download is not None:
+            self.on_download(url_list)
+
+    def extract_info(self, url, download=False):
+        # No info means DownloadThread falls back to its plain output template
+        return None
+
+    def process_ie_result(self, info, download=True):
+        return info
+
+
+@pytest.fixture
+def fake_ytdl(monkeypatch, download_threads_module):
+    """Replace yt_dlp.YoutubeDL and check_ffmpeg as seen by download_threads.
+
+    Returns the FakeYoutubeDL instance so tests can inspect the recorded
+    options and download calls. FFmpeg is reported as available.
+    """
+    fake = FakeYoutubeDL()
+    monkeypatch.setattr(download_threads_module.yt_dlp, "YoutubeDL", fake)
+    monkeypatch.setattr(download_threads_module, "check_ffmpeg", lambda: True)
+    return fake
 
 
 @pytest.fixture(autouse=True)
@@ -146,25 +324,17 @@ def patch_loggers():
     tests patch CustomTkinter in different ways; a dedicated fixture
     `mock_ctk_init` is provided if a test wants to stub the CTk ctor.
     """
-    patches = []
-    # Patch the GUI's AppLogger to prevent file I/O
-    p1 = patch("gui.main_window.AppLogger")
-    mock_app_logger = p1.start()
-    patches.append(p1)
+    with ExitStack() as stack:
+        # Patch the GUI's AppLogger to prevent file I/O
+        mock_app_logger = stack.enter_context(patch("gui.main_window.AppLogger"))
 
-    # Patch cookie_manager's AppLogger too (some tests patch this separately)
-    p2 = patch("cookie_manager.AppLogger")
-    mock_cookie_logger = p2.start()
-    patches.append(p2)
+        # Patch cookie_manager's AppLogger too (some tests patch this separately)
+        mock_cookie_logger = stack.enter_context(patch("cookie_manager.AppLogger"))
 
-    try:
         yield {
             "mock_app_logger": mock_app_logger,
             "mock_cookie_logger": mock_cookie_logger,
         }
-    finally:
-        for p in reversed(patches):
-            p.stop()
 
 
 @pytest.fixture
@@ -182,21 +352,111 @@ def mock_ctk_init():
         p.stop()
 
 
+@pytest.fixture(scope="session")
+def _cookie_manager_cls():
+    """Resolve the CookieManager class once per session, or None if unavailable."""
+    # Delay importing CookieManager to avoid circular imports during collection
+    try:
+        from cookie_manager import CookieManager
+
+        return CookieManager
+    except Exception:
+        return None
+
+
+@pytest.fixture(scope="session")
+def loaded_cookies():
+    """Import COOKIE_FILE into the global cookie manager once per session.
+
+    get_cookie_manager() already returns a process-wide singleton, so every
+    test that takes this fixture shares the same imported cookie jar instead
+    of re-parsing the cookie file on each invocation.
+    """
+    from cookie_manager import get_cookie_manager
+
+    cookie_manager = get_cookie_manager()
+    success = cookie_manager.import_cookies_from_file(COOKIE_FILE_STR)
+    assert success, "Failed to load cookies"
+    return cookie_manager
+
+
 @pytest.fixture
-def mock_get_cookie_manager():
+def temp_download_dir():
+    """Create a temporary directory for a real download test"""
+    with tempfile.TemporaryDirectory(
+        prefix="ytdl_e2e_", ignore_cleanup_errors=True
+    ) as temp_dir:
+        yield temp_dir
+
+
+# Helpers shared by the real-download modules, which import them from
+# tests.conftest
+
+
+class CompletionQueue(queue.SimpleQueue):
+    """SimpleQueue that sets `done` when a worker posts its terminal message
+
+    Lets tests return as soon as the download reports finished/error instead
+    of sitting in thread.join() for the full timeout. The terminal message
+    is kept in `last_terminal` so tests can assert on it without draining.
+    Workers only ever put() and tests only get(), so SimpleQueue's lighter C
+    implementation is enough.
+    """
+
+    TERMINAL_TYPES = frozenset(
+        {"finished", "error", "playlist_video_finished", "playlist_video_error"}
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.done = threading.Event()
+        self.last_terminal = None
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        if item.get("type") in self.TERMINAL_TYPES:
+            self.last_terminal = item
+            self.done.set()
+
+
+def drain_queue(q):
+    """Take every pending message off a queue without blocking
+
+    Works for queue.Queue, SimpleQueue and the test stand-ins alike. Only
+    called once the producer has finished, so nothing is produced
+    concurrently with the drain.
+    """
+    items = []
+    while True:
+        try:
+            items.append(q.get_nowait())
+        except queue.Empty:
+            return items
+
+
+def first_file(directory):
+    """Return the first file in directory as a DirEntry, or None
+
+    The per-test directory only ever holds download output, so no name
+    filter is needed; the scan stops at the first file and the entry's
+    stat() result is cached.
+    """
+    with os.scandir(directory) as entries:
+        return next((entry for entry in entries if entry.is_file()), None)
+
+
+@pytest.fixture
+def mock_get_cookie_manager(_cookie_manager_cls):
     """Patch gui.main_window.get_cookie_manager and return a Mock CookieManager.
 
     Tests can use this fixture to get a fresh Mock(spec=CookieManager) and
     inspect calls or set return values for the cookie manager used by the app.
     """
     with patch("gui.main_window.get_cookie_manager") as mg:
-        # Delay importing CookieManager to avoid circular imports during collection
-        try:
-            from cookie_manager import CookieManager
-
-            mock_manager = Mock(spec=CookieManager)
-        except Exception:
-            # If CookieManager is not importable at collection time, fall back to a plain Mock
+        # If CookieManager is not importable, fall back to a plain Mock
+        if _cookie_manager_cls is not None:
+            mock_manager = Mock(spec=_cookie_manager_cls)
+        else:
             mock_manager = Mock()
 
         mg.return_value = mock_manager
@@ -0,0 +1,43 @@
+import pytest
+
+
+class _NoopThread:
+    """Stand-in for threading.Thread that records its target but never runs it."""
+
+    def __init__(self, *args, target=None, **kwargs):
+        self.target = target
+
+    def start(self):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def noop_thread(monkeypatch):
+    """Autouse fixture that stops the GUI from spawning worker threads.
+
+    Cookie operations in `gui.main_window` run their work in a background
+    `threading.Thread`. Integration tests only exercise the synchronous part;
+    the created stand-ins are returned so a test can run a worker body inline.
+    """
+    created = []
+
+    def _factory(*args, **kwargs):
+        thread = _NoopThread(*args, **kwargs)
+        created.append(thread)
+        return thread
+
+    monkeypatch.setattr("gui.main_window.threading.Thread", _factory)
+    return created
+
+
+@pytest.fixture
+def patched_filedialog(monkeypatch, tmp_path):
+    """Write a Netscape cookie file and make the file dialog return its path."""
+    cookie_file = tmp_path / "cookies.txt"
+    cookie_file.write_text(
+        "# Netscape HTTP Cookie File\n.youtube.com\tTRUE\t/\tFALSE\t1234567890\ttest_token\ttest_value\n"
+    )
+    monkeypatch.setattr(
+        "gui.main_window.filedialog.askopenfilename", lambda *a, **k: str(cookie_file)
+    )
+    return cookie_file
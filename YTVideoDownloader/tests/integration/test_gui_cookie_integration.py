@@ -9,16 +9,8 @@ concise fixture usage.
 """
 
 
-def _noop_thread_factory(*args, **kwargs):
-    class T:
-        def start(self):
-            return None
-
-    return T()
-
-
 def test_end_to_end_cookie_import_success(
-    video_downloader_app, mock_get_cookie_manager, tmp_path, monkeypatch
+    video_downloader_app, mock_get_cookie_manager, patched_filedialog
 ):
     app = video_downloader_app
     mock_cm = mock_get_cookie_manager
@@ -26,34 +18,22 @@ def test_end_to_end_cookie_import_success(
     mock_cm.import_cookies_from_file.return_value = True
     mock_cm.get_cookie_status.return_value = "5 cookies available from import"
 
-    temp_file = tmp_path / "cookies.txt"
-    temp_file.write_text(
-        "# Netscape HTTP Cookie File\n.youtube.com\tTRUE\t/\tFALSE\t1234567890\ttest_token\ttest_value\n"
-    )
-
-    monkeypatch.setattr(
-        "gui.main_window.filedialog.askopenfilename", lambda *a, **k: str(temp_file)
-    )
-    monkeypatch.setattr("gui.main_window.threading.Thread", _noop_thread_factory)
-
     app.import_cookie_file_enhanced()
 
     assert app.cookie_operation_in_progress
 
     # Simulate completion handler that the thread would have invoked
-    app._handle_import_complete(True, "Import successful", "cookies.txt")
+    app._handle_import_complete(True, "Import successful", patched_filedialog.name)
 
 
 def test_end_to_end_cookie_refresh_success(
-    video_downloader_app, mock_get_cookie_manager, monkeypatch
+    video_downloader_app, mock_get_cookie_manager
 ):
     app = video_downloader_app
     mock_cm = mock_get_cookie_manager
     mock_cm.refresh_cookies.return_value = True
     mock_cm.get_cookie_status.return_value = "10 cookies available from Chrome"
 
-    monkeypatch.setattr("gui.main_window.threading.Thread", _noop_thread_factory)
-
     app.refresh_cookies_enhanced()
 
     assert app.cookie_operation_in_progress
@@ -63,15 +43,13 @@ def test_end_to_end_cookie_refresh_success(
 
 
 def test_end_to_end_browser_detection_success(
-    video_downloader_app, mock_get_cookie_manager, monkeypatch
+    video_downloader_app, mock_get_cookie_manager
 ):
     app = video_downloader_app
     mock_cm = mock_get_cookie_manager
     mock_cm.get_available_browsers.return_value = ["Chrome", "Firefox"]
     mock_cm.get_cookie_status.return_value = "Chrome and Firefox detected"
 
-    monkeypatch.setattr("gui.main_window.threading.Thread", _noop_thread_factory)
-
     app.refresh_browser_detection()
 
     assert app.cookie_operation_in_progress
@@ -115,10 +93,11 @@ def test_concurrent_operation_prevention(video_downloader_app, monkeypatch):
     )
 
 
-def test_gui_thread_safety(video_downloader_app):
+def test_gui_thread_safety(video_downloader_app, noop_thread):
     app = video_downloader_app
     # Ensure after is used when scheduling GUI updates
     app.refresh_cookies_enhanced()
+    noop_thread[-1].target()
     assert app.after.called
 
 
@@ -137,15 +116,11 @@ def test_button_state_management(video_downloader_app):
     app.browser_refresh_btn.configure.assert_called_with(state="normal")
 
 
-def test_error_handling_integration(
-    video_downloader_app, mock_get_cookie_manager, monkeypatch
-):
+def test_error_handling_integration(video_downloader_app, mock_get_cookie_manager):
     app = video_downloader_app
     mock_cm = mock_get_cookie_manager
     mock_cm.refresh_cookies.side_effect = Exception("Test cookie error")
 
-    monkeypatch.setattr("gui.main_window.threading.Thread", _noop_thread_factory)
-
     app.refresh_cookies_enhanced()
     assert app.cookie_operation_in_progress
 
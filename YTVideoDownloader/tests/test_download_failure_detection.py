@@ -6,8 +6,8 @@ Specifically tests the truncated YouTube ID issue where yt-dlp fails silently.
 
 import os
 import queue
-import shutil
 import tempfile
+from collections import Counter
 from unittest.mock import Mock, patch
 
 import pytest
@@ -15,13 +15,20 @@ import pytest
 from download_threads import DownloadThread
 
 
+# Truncated YouTube URLs that cause silent failures
+TRUNCATED_URLS = (
+    "https://www.youtube.com/watch?v=I005",
+    "https://www.youtube.com/watch?v=I00A",
+    "https://www.youtube.com/watch?v=ABC",
+    "https://www.youtube.com/watch?v=12",
+)
+
+
 @pytest.fixture
 def temp_dir():
     """Provide temporary directory"""
-    temp = tempfile.mkdtemp()
-    yield temp
-    if os.path.exists(temp):
-        shutil.rmtree(temp)
+    with tempfile.TemporaryDirectory() as temp:
+        yield temp
 
 
 @pytest.fixture
@@ -30,18 +37,13 @@ def update_queue():
     return queue.Queue()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def truncated_urls():
     """Provide truncated YouTube URLs that cause silent failures"""
-    return [
-        "https://www.youtube.com/watch?v=I005",
-        "https://www.youtube.com/watch?v=I00A",
-        "https://www.youtube.com/watch?v=ABC",
-        "https://www.youtube.com/watch?v=12",
-    ]
+    return TRUNCATED_URLS
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_url():
     """Provide valid YouTube URL"""
     return "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
@@ -49,6 +51,15 @@ def valid_url():
 
 def get_queue_messages(queue_obj):
     """Helper to get all messages from queue"""
+    mutex = getattr(queue_obj, "mutex", None)
+    if mutex is not None and hasattr(queue_obj, "queue"):
+        # Swap the whole backing deque out under one lock acquisition
+        with mutex:
+            messages = list(queue_obj.queue)
+            queue_obj.queue.clear()
+            queue_obj.not_full.notify_all()
+        return messages
+
     messages = []
     while not queue_obj.empty():
         try:
@@ -60,22 +71,15 @@ def get_queue_messages(queue_obj):
 
 def count_files_in_directory(directory):
     """Count files in directory"""
-    if not os.path.exists(directory):
+    try:
+        with os.scandir(directory) as entries:
+            return sum(1 for entry in entries if entry.is_file())
+    except FileNotFoundError:
         return 0
-    return len(
-        [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
-    )
 
 
-@pytest.mark.parametrize(
-    "truncated_url",
-    [
-        "https://www.youtube.com/watch?v=I005",
-        "https://www.youtube.com/watch?v=I00A",
-        "https://www.youtube.com/watch?v=ABC",
-        "https://www.youtube.com/watch?v=12",
-    ],
-)
+@pytest.mark.network
+@pytest.mark.parametrize("truncated_url", TRUNCATED_URLS)
 def test_truncated_youtube_id_detection(temp_dir, update_queue, truncated_url):
     """Test that truncated YouTube IDs are properly detected as failures"""
     files_before = count_files_in_directory(temp_dir)
@@ -96,19 +100,18 @@ def test_truncated_youtube_id_detection(temp_dir, update_queue, truncated_url):
 
     files_created = files_after > files_before
 
-    finished_messages = [msg for msg in messages if msg.get("type") == "finished"]
-    error_messages = [msg for msg in messages if msg.get("type") == "error"]
+    message_counts = Counter(msg.get("type") for msg in messages)
 
     if not files_created:
         assert (
-            len(finished_messages) == 0
+            message_counts["finished"] == 0
         ), f"Download incorrectly reported as finished for {truncated_url} when no files were created"
         assert (
-            len(error_messages) > 0
+            message_counts["error"] > 0
         ), f"Download should report error for {truncated_url} when no files were created"
     else:
         assert (
-            len(finished_messages) > 0
+            message_counts["finished"] > 0
         ), f"Download should report success for {truncated_url} when files were created"
 
 
@@ -139,15 +142,14 @@ def test_yt_dlp_silent_failure_simulation(temp_dir, update_queue, truncated_urls
 
         files_created = files_after > files_before
 
-        finished_messages = [msg for msg in messages if msg.get("type") == "finished"]
-        error_messages = [msg for msg in messages if msg.get("type") == "error"]
+        message_counts = Counter(msg.get("type") for msg in messages)
 
         if not files_created:
             assert (
-                len(finished_messages) == 0
+                message_counts["finished"] == 0
             ), "Download incorrectly reported as finished when no files were created"
             assert (
-                len(error_messages) > 0
+                message_counts["error"] > 0
             ), "Download should report error when no files were created"
 
 
@@ -173,22 +175,20 @@ def test_successful_download_detection(temp_dir, update_queue, valid_url):
             update_queue=update_queue,
         )
 
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=10.0)
+        # Run the download body inline; no worker thread is needed with yt-dlp mocked
+        thread.run()
 
         files_after = count_files_in_directory(temp_dir)
         messages = get_queue_messages(update_queue)
 
         files_created = files_after > files_before
 
-        finished_messages = [msg for msg in messages if msg.get("type") == "finished"]
-        error_messages = [msg for msg in messages if msg.get("type") == "error"]
+        message_counts = Counter(msg.get("type") for msg in messages)
 
         assert files_created is True, "Test file should have been created"
         assert (
-            len(finished_messages) > 0
+            message_counts["finished"] > 0
         ), "Download should report success when files were created"
         assert (
-            len(error_messages) == 0
+            message_counts["error"] == 0
         ), "No errors should be reported for successful download"
@@ -15,22 +15,27 @@ Tests for ALL remaining features not covered by other E2E tests:
 These tests achieve 100% feature coverage with real YouTube data.
 
 Run with: pytest tests/test_e2e_complete_coverage.py -v -s
+Run in parallel with: pytest tests/test_e2e_complete_coverage.py -n auto --dist loadgroup -v
+
+Playlist metadata is kept in pytest's cache (.pytest_cache) for up to an hour;
+run with --cache-clear or set E2E_REFRESH_METADATA=1 to fetch it fresh.
 """
 
+import collections
+import hashlib
+import json
 import os
 import queue
 import re
-import shutil
-import tempfile
 import time
 from pathlib import Path
 
 import pytest
 import yt_dlp
 
-from cookie_manager import get_cookie_manager
 from download_threads import DownloadThread
 from playlist_downloader import PlaylistDownloader
+from tests.conftest import drain_queue
 from utils import (
     clean_url_for_video_info,
     is_playlist_url,
@@ -45,17 +50,22 @@ pytestmark = pytest.mark.skipif(
     reason="youtube.com_cookies.txt not found - required for E2E tests"
 )
 
+# Known small public playlist shared by the playlist tests
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLrAXtmErZgOeiKm4sgNOknGvNjby9efdf"
 
-@pytest.fixture
-def temp_download_dir():
-    """Create temporary directory for downloads"""
-    temp_dir = tempfile.mkdtemp(prefix="e2e_coverage_")
-    yield temp_dir
-    if os.path.exists(temp_dir):
-        try:
-            shutil.rmtree(temp_dir)
-        except Exception as e:
-            print(f"Warning: Could not clean up {temp_dir}: {e}")
+# Smallest format that is already muxed, so yt-dlp has nothing to merge with ffmpeg
+FAST_FORMAT = "worst[ext=mp4]/worst[acodec!=none][vcodec!=none]/worst"
+
+# Container formats the playlist download test counts as videos
+VIDEO_EXTENSIONS = frozenset({".mp4", ".webm", ".mkv"})
+
+# Message types that DownloadThread/PlaylistDownloader send when they are done
+TERMINAL_MESSAGE_TYPES = frozenset({"finished", "error", "playlist_finished", "playlist_error"})
+
+# pytest cache entries for playlist metadata, so repeat runs skip the YouTube
+# round-trip, and how long they stay fresh (seconds)
+METADATA_CACHE_PREFIX = "e2e_complete_coverage/playlist_info"
+METADATA_CACHE_TTL = 3600
 
 
 @pytest.fixture
@@ -64,47 +74,192 @@ def update_queue():
     return queue.Queue()
 
 
+class DequeQueue:
+    """Minimal queue.Queue stand-in backed by a lock-free collections.deque
+
+    Only the operations DownloadThread and these tests use are provided.
+    Blocking get() polls, which is fine for a single consumer in a test.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self):
+        self._items = collections.deque()
+
+    def put(self, item, block=True, timeout=None):
+        self._items.append(item)
+
+    def get(self, block=True, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                if not block or (deadline is not None and time.monotonic() >= deadline):
+                    raise queue.Empty from None
+                time.sleep(self.POLL_INTERVAL)
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def empty(self):
+        return not self._items
+
+    def qsize(self):
+        return len(self._items)
+
+
 @pytest.fixture
-def loaded_cookies():
-    """Ensure cookies are loaded before each test"""
-    cookie_manager = get_cookie_manager()
-    success = cookie_manager.import_cookies_from_file(str(COOKIE_FILE))
-    assert success, "Failed to load cookies"
-    return cookie_manager
+def progress_queue():
+    """Queue for the progress-heavy test; E2E_FAST_QUEUE=1 swaps in DequeQueue
+
+    The default stays queue.Queue so the production blocking semantics are covered.
+    """
+    if os.environ.get("E2E_FAST_QUEUE") == "1":
+        return DequeQueue()
+    return queue.Queue()
+
+
+@pytest.fixture(scope="session")
+def shared_ydl(loaded_cookies):
+    """One cookie-configured YoutubeDL reused for every metadata extraction"""
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": True,  # Only get playlist info
+    }
+
+    from utils import setup_ytdlp_cookies
+    setup_ytdlp_cookies(ydl_opts, loaded_cookies, "https://www.youtube.com/", None, "test")
+
+    ydl = yt_dlp.YoutubeDL(ydl_opts)
+    yield ydl
+    ydl.close()
+
+
+def _cached_extract_flat(normalized, ydl, cache):
+    """Return flat playlist info for a normalized URL, cached between runs
+
+    Entries live in pytest's cache keyed by the normalized playlist URL and
+    expire after METADATA_CACHE_TTL. Set E2E_REFRESH_METADATA=1 (or run with
+    --cache-clear) to ignore the cache and fetch fresh metadata.
+    """
+    key = f"{METADATA_CACHE_PREFIX}/{hashlib.sha1(normalized.encode('utf-8')).hexdigest()}"
+
+    if cache is not None and os.environ.get("E2E_REFRESH_METADATA") != "1":
+        cached = cache.get(key, None)
+        if cached and time.time() - cached.get("saved_at", 0) < METADATA_CACHE_TTL:
+            return cached["info"]
+
+    info = ydl.extract_info(normalized, download=False)
+
+    if info is not None and cache is not None:
+        # Round-trip through JSON so non-serializable values become strings
+        info = json.loads(json.dumps(info, default=str))
+        cache.set(key, {"saved_at": time.time(), "info": info})
 
+    return info
 
+
+@pytest.fixture(scope="session")
+def normalized_playlist_url():
+    """PLAYLIST_URL normalized once for the whole session"""
+    return normalize_playlist_url(PLAYLIST_URL)
+
+
+@pytest.fixture(scope="session")
+def playlist_info(request, shared_ydl, normalized_playlist_url):
+    """Extract the test playlist once per session
+
+    Returns:
+        tuple: (info, entries) where entries excludes unavailable (None) items
+    """
+    cache = getattr(request.config, "cache", None)
+    info = _cached_extract_flat(normalized_playlist_url, shared_ydl, cache)
+    entries = tuple(e for e in (info or {}).get("entries") or () if e is not None)
+    return info, entries
+
+
+def _entries_to_selected(entries, limit=None):
+    """Build the selected_videos list PlaylistDownloader expects from flat entries"""
+    selected_videos = []
+    for idx, entry in enumerate(entries[:limit]):
+        video_id = entry.get("id") or entry.get("url") or ""
+        if not video_id.startswith("http"):
+            video_url = f"https://www.youtube.com/watch?v={video_id}"
+        else:
+            video_url = video_id
+
+        selected_videos.append({
+            "url": video_url,
+            "title": entry.get("title", "Unknown"),
+            "index": idx,
+        })
+    return selected_videos
+
+
+def _list_files(directory):
+    """List regular files in directory with a single scandir pass"""
+    with os.scandir(directory) as entries:
+        return [Path(e.path) for e in entries if e.is_file()]
+
+
+def _list_videos(directory):
+    """List downloaded video files in directory with a single scandir pass"""
+    return [f for f in _list_files(directory) if f.suffix.lower() in VIDEO_EXTENSIONS]
+
+
+def _wait_for(q, sentinels, timeout):
+    """Collect queue messages until one whose type is in sentinels arrives
+
+    Returns as soon as the worker signals completion instead of waiting on
+    thread.join(). Anything queued alongside the sentinel is drained too.
+    Gives up and returns what was collected once timeout seconds pass.
+    """
+    deadline = time.monotonic() + timeout
+    messages = []
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            msg = q.get(timeout=remaining)
+        except queue.Empty:
+            break
+        messages.append(msg)
+        if msg.get("type") in sentinels:
+            messages.extend(drain_queue(q))
+            break
+    return messages
+
+
+@pytest.mark.fast
 class TestURLProcessing:
     """Test URL validation, normalization, and cleaning"""
 
-    def test_playlist_url_detection(self):
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            # Positive cases - should be detected as playlists
+            ("https://www.youtube.com/playlist?list=PLrAXtmErZgOeiKm4sgNOknGvNjby9efdf", True),
+            ("https://www.youtube.com/watch?v=abc123&list=PLtest", True),
+            ("https://www.youtube.com/watch?list=PLtest&v=abc123", True),
+            ("https://www.youtube.com/user/username/playlists", True),
+            ("https://www.youtube.com/channel/UCtest/playlists", True),
+            # Negative cases - should NOT be detected as playlists
+            ("https://www.youtube.com/watch?v=jNQXAC9IVRw", False),
+            ("https://youtu.be/jNQXAC9IVRw", False),
+            ("https://www.vimeo.com/123456", False),
+        ],
+    )
+    def test_playlist_url_detection(self, url, expected):
         """Test that playlist URLs are correctly identified"""
-        # Positive cases - should be detected as playlists
-        playlist_urls = [
-            "https://www.youtube.com/playlist?list=PLrAXtmErZgOeiKm4sgNOknGvNjby9efdf",
-            "https://www.youtube.com/watch?v=abc123&list=PLtest",
-            "https://www.youtube.com/watch?list=PLtest&v=abc123",
-            "https://www.youtube.com/user/username/playlists",
-            "https://www.youtube.com/channel/UCtest/playlists",
-        ]
-        
-        for url in playlist_urls:
-            assert is_playlist_url(url), f"Should detect as playlist: {url}"
-        
-        # Negative cases - should NOT be detected as playlists
-        video_urls = [
-            "https://www.youtube.com/watch?v=jNQXAC9IVRw",
-            "https://youtu.be/jNQXAC9IVRw",
-            "https://www.vimeo.com/123456",
-        ]
-        
-        for url in video_urls:
-            assert not is_playlist_url(url), f"Should NOT detect as playlist: {url}"
-        
-        print(f"[OK] Playlist URL detection works correctly")
-
-    def test_playlist_url_normalization(self):
-        """Test that playlist URLs are normalized correctly"""
-        test_cases = [
+        assert is_playlist_url(url) is expected, \
+            f"Should {'' if expected else 'NOT '}detect as playlist: {url}"
+
+    @pytest.mark.parametrize(
+        "original,expected",
+        [
             (
                 "https://www.youtube.com/watch?v=abc123&list=PLtest&index=5",
                 "https://www.youtube.com/playlist?list=PLtest"
@@ -117,17 +272,20 @@ class TestURLProcessing:
                 "https://www.youtube.com/playlist?list=PLtest&index=10",
                 "https://www.youtube.com/playlist?list=PLtest"
             ),
-        ]
-        
-        for original, expected in test_cases:
-            result = normalize_playlist_url(original)
-            assert result == expected, f"Normalization failed: {original} -> {result} (expected {expected})"
-        
-        print(f"[OK] Playlist URL normalization works correctly")
+        ],
+    )
+    def test_playlist_url_normalization(self, original, expected):
+        """Test that playlist URLs are normalized correctly"""
+        result = normalize_playlist_url(original)
+        assert result == expected, f"Normalization failed: {original} -> {result} (expected {expected})"
 
-    def test_url_cleaning_for_video_info(self):
-        """Test that URLs are cleaned for video info extraction"""
-        test_cases = [
+    def test_shared_playlist_url_is_normalized(self):
+        """Test that the shared PLAYLIST_URL is already in normalized form"""
+        assert normalize_playlist_url(PLAYLIST_URL) == PLAYLIST_URL, "URL should already be normalized"
+
+    @pytest.mark.parametrize(
+        "original,expected",
+        [
             (
                 "https://www.youtube.com/watch?v=jNQXAC9IVRw&list=PLtest",
                 "https://www.youtube.com/watch?v=jNQXAC9IVRw"
@@ -140,45 +298,26 @@ class TestURLProcessing:
                 "https://www.youtube.com/embed/jNQXAC9IVRw",
                 "https://www.youtube.com/watch?v=jNQXAC9IVRw"
             ),
-        ]
-        
-        for original, expected in test_cases:
-            result = clean_url_for_video_info(original)
-            assert result == expected, f"Cleaning failed: {original} -> {result} (expected {expected})"
-        
-        print(f"[OK] URL cleaning works correctly")
+        ],
+    )
+    def test_url_cleaning_for_video_info(self, original, expected):
+        """Test that URLs are cleaned for video info extraction"""
+        result = clean_url_for_video_info(original)
+        assert result == expected, f"Cleaning failed: {original} -> {result} (expected {expected})"
 
 
 class TestPlaylistInfoExtraction:
     """Test playlist information extraction"""
 
-    def test_extract_playlist_info(self, loaded_cookies):
+    def test_extract_playlist_info(self, playlist_info):
         """Test extracting playlist information from YouTube"""
-        # Use a known small public playlist
-        playlist_url = "https://www.youtube.com/playlist?list=PLrAXtmErZgOeiKm4sgNOknGvNjby9efdf"
-        
-        # Normalize URL
-        normalized = normalize_playlist_url(playlist_url)
-        assert normalized == playlist_url, "URL should already be normalized"
-        
         # Extract playlist info
-        ydl_opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "extract_flat": True,  # Only get playlist info
-        }
-        
-        from utils import setup_ytdlp_cookies
-        setup_ytdlp_cookies(ydl_opts, loaded_cookies, playlist_url, None, "test")
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(normalized, download=False)
+        info, entries = playlist_info
         
         assert info is not None, "Should extract playlist info"
         assert "title" in info, "Should have playlist title"
         assert "entries" in info, "Should have playlist entries"
         
-        entries = [e for e in info["entries"] if e is not None]
         assert len(entries) > 0, "Should have at least one video"
         
         # Check first entry has expected fields
@@ -191,48 +330,28 @@ class TestPlaylistInfoExtraction:
         print(f"     First video: {first_entry.get('title', 'Unknown')}")
 
 
+@pytest.mark.xdist_group("playlist")
 class TestCompletePlaylistDownload:
     """Test complete playlist download scenarios"""
 
-    def test_download_playlist_all_videos(self, temp_download_dir, update_queue, loaded_cookies):
-        """Test downloading ALL videos from a small playlist"""
-        # Use a very small test playlist (ideally 2-3 videos max)
-        playlist_url = "https://www.youtube.com/playlist?list=PLrAXtmErZgOeiKm4sgNOknGvNjby9efdf"
-        
-        # First extract playlist info
-        ydl_opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "extract_flat": True,
-        }
-        
-        from utils import setup_ytdlp_cookies
-        setup_ytdlp_cookies(ydl_opts, loaded_cookies, playlist_url, None, "test")
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(normalize_playlist_url(playlist_url), download=False)
-        
-        entries = [e for e in info["entries"] if e is not None]
-        
-        # Limit to first 2 videos for testing speed
-        entries = entries[:2]
-        
-        # Build selected_videos list in the format PlaylistDownloader expects
-        selected_videos = []
-        for idx, entry in enumerate(entries):
-            video_id = entry.get("id", entry.get("url", ""))
-            if not video_id.startswith("http"):
-                video_url = f"https://www.youtube.com/watch?v={video_id}"
-            else:
-                video_url = video_id
-            
-            selected_videos.append({
-                "url": video_url,
-                "title": entry.get("title", "Unknown"),
-                "index": idx,
-            })
-        
-        print(f"\n[INFO] Downloading {len(selected_videos)} videos from playlist")
+    @pytest.mark.parametrize(
+        "selection,limit,exact_files",
+        [
+            # ALL videos of a small playlist, capped at 2 for testing speed
+            ("all", 2, None),
+            # Only the FIRST video (simulating user selection in the GUI)
+            ("first_only", 1, 1),
+        ],
+    )
+    def test_playlist_download(self, selection, limit, exact_files, temp_download_dir, update_queue, playlist_info):
+        """Test downloading all or only selected videos from a playlist
+
+        Both cases reuse the session's single playlist metadata fetch.
+        """
+        _, entries = playlist_info
+        selected_videos = _entries_to_selected(entries, limit=limit)
+        
+        print(f"\n[INFO] Downloading {len(selected_videos)} videos from playlist ({selection})")
         
         # Create PlaylistDownloader
         downloader = PlaylistDownloader(
@@ -245,30 +364,23 @@ class TestCompletePlaylistDownload:
         )
         
         downloader.start()
-        if downloader.thread:
-            downloader.thread.join(timeout=180.0)  # 3 minutes max
-        
-        # Collect messages
-        messages = []
-        while not update_queue.empty():
-            try:
-                msg = update_queue.get_nowait()
-                messages.append(msg)
-                if msg.get("type") in ["playlist_status", "playlist_finished", "playlist_error"]:
-                    print(f"     {msg.get('text', msg)}")
-            except queue.Empty:
-                break
+        # Collect messages until the playlist reports completion (90s per video max)
+        messages = _wait_for(update_queue, TERMINAL_MESSAGE_TYPES, 90.0 * len(selected_videos))
+        for msg in messages:
+            if msg.get("type") in ["playlist_status", "playlist_finished", "playlist_error"]:
+                print(f"     {msg.get('text', msg)}")
         
         # Check for completion
         finished = [m for m in messages if m.get("type") == "playlist_finished"]
         assert len(finished) > 0, f"Should complete playlist download. Messages: {[m for m in messages if 'error' in m.get('type', '')]}"
         
         # Verify files were downloaded
-        video_files = list(Path(temp_download_dir).glob("*.mp4")) + \
-                     list(Path(temp_download_dir).glob("*.webm")) + \
-                     list(Path(temp_download_dir).glob("*.mkv"))
-        
-        assert len(video_files) >= 1, f"Should download at least 1 video. Found files: {list(Path(temp_download_dir).iterdir())}"
+        if exact_files is not None:
+            video_files = _list_files(temp_download_dir)
+            assert len(video_files) == exact_files, f"Should download exactly {exact_files} video(s), found {len(video_files)}"
+        else:
+            video_files = _list_videos(temp_download_dir)
+            assert len(video_files) >= 1, f"Should download at least 1 video. Found files: {list(Path(temp_download_dir).iterdir())}"
         
         print(f"[OK] Downloaded {len(video_files)} videos from playlist")
         for f in video_files:
@@ -277,80 +389,26 @@ class TestCompletePlaylistDownload:
             except UnicodeEncodeError:
                 print(f"     - {f.name.encode('ascii', errors='ignore').decode('ascii')}")
 
-    def test_download_selected_playlist_videos(self, temp_download_dir, update_queue, loaded_cookies):
-        """Test downloading only SELECTED videos from a playlist"""
-        # This simulates user selecting specific videos in the GUI
-        playlist_url = "https://www.youtube.com/playlist?list=PLrAXtmErZgOeiKm4sgNOknGvNjby9efdf"
-        
-        # Extract playlist
-        ydl_opts = {"quiet": True, "no_warnings": True, "extract_flat": True}
-        from utils import setup_ytdlp_cookies
-        setup_ytdlp_cookies(ydl_opts, loaded_cookies, playlist_url, None, "test")
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(normalize_playlist_url(playlist_url), download=False)
-        
-        entries = [e for e in info["entries"] if e is not None]
-        
-        # Select only the FIRST video (simulating user selection)
-        selected_entry = entries[0]
-        video_id = selected_entry.get("id", selected_entry.get("url", ""))
-        if not video_id.startswith("http"):
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-        else:
-            video_url = video_id
-        
-        selected_videos = [{
-            "url": video_url,
-            "title": selected_entry.get("title", "Unknown"),
-            "index": 0,
-        }]
-        
-        print(f"\n[INFO] Downloading 1 selected video: {selected_videos[0]['title']}")
-        
-        downloader = PlaylistDownloader(
-            selected_videos=selected_videos,
-            format_id="worst",
-            output_path=temp_download_dir,
-            update_queue=update_queue
-        )
-        
-        downloader.start()
-        if downloader.thread:
-            downloader.thread.join(timeout=90.0)
-        
-        # Verify exactly 1 file downloaded
-        video_files = list(Path(temp_download_dir).glob("*.*"))
-        assert len(video_files) == 1, f"Should download exactly 1 video, found {len(video_files)}"
-        
-        print(f"[OK] Downloaded selected video: {video_files[0].name}")
-
 
+@pytest.mark.xdist_group("progress")
 class TestProgressTracking:
     """Test that progress tracking works correctly"""
 
-    def test_single_video_progress_updates(self, temp_download_dir, update_queue, loaded_cookies):
+    def test_single_video_progress_updates(self, temp_download_dir, progress_queue, loaded_cookies):
         """Test that progress updates are sent during download"""
         test_url = "https://www.youtube.com/watch?v=jNQXAC9IVRw"
         
         thread = DownloadThread(
             url=test_url,
-            format_id="worst",  # Small file for quick test
+            format_id=FAST_FORMAT,  # Small single-file format for quick test
             output_path=temp_download_dir,
-            update_queue=update_queue
+            update_queue=progress_queue
         )
         
         thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=60.0)
         
         # Collect all messages
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
+        messages = _wait_for(progress_queue, TERMINAL_MESSAGE_TYPES, 60.0)
         
         # Check for progress messages
         progress_msgs = [m for m in messages if m.get("type") == "progress"]
@@ -368,13 +426,24 @@ class TestProgressTracking:
         print(f"     Progress range: {min(progress_values)}% - {max(progress_values)}%")
 
 
+@pytest.mark.xdist_group("errors")
 class TestErrorHandling:
     """Test error handling scenarios"""
 
-    def test_invalid_video_url_error(self, temp_download_dir, update_queue, loaded_cookies):
-        """Test that invalid video URLs produce appropriate errors"""
+    def test_invalid_video_url_error(self, temp_download_dir, update_queue, monkeypatch):
+        """Test that invalid video URLs produce appropriate errors
+        
+        YouTube's answer for an unknown ID is predictable, so yt-dlp is made to raise
+        the same DownloadError locally instead of waiting on the network.
+        """
         invalid_url = "https://www.youtube.com/watch?v=INVALIDID123"
         
+        def _unavailable(*args, **kwargs):
+            raise yt_dlp.utils.DownloadError("ERROR: [youtube] INVALIDID123: Video unavailable")
+        
+        monkeypatch.setattr(yt_dlp.YoutubeDL, "extract_info", _unavailable)
+        monkeypatch.setattr(yt_dlp.YoutubeDL, "download", _unavailable)
+        
         thread = DownloadThread(
             url=invalid_url,
             format_id="best",
@@ -383,16 +452,9 @@ class TestErrorHandling:
         )
         
         thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=30.0)
         
         # Check for error message
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
+        messages = _wait_for(update_queue, TERMINAL_MESSAGE_TYPES, 30.0)
         
         error_msgs = [m for m in messages if m.get("type") == "error"]
         assert len(error_msgs) > 0, "Should receive error message for invalid URL"
@@ -405,6 +467,7 @@ class TestErrorHandling:
         print(f"[OK] Invalid URL properly handled with error: {error_text[:100]}")
 
 
+@pytest.mark.xdist_group("naming")
 class TestFileNaming:
     """Test file naming and uniqueness handling"""
 
@@ -414,17 +477,16 @@ class TestFileNaming:
         
         thread = DownloadThread(
             url=test_url,
-            format_id="worst",
+            format_id=FAST_FORMAT,
             output_path=temp_download_dir,
             update_queue=update_queue
         )
         
         thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=60.0)
+        _wait_for(update_queue, TERMINAL_MESSAGE_TYPES, 60.0)
         
         # Check filename
-        video_files = list(Path(temp_download_dir).glob("*.*"))
+        video_files = _list_files(temp_download_dir)
         assert len(video_files) > 0, "Should create file"
         
         filename = video_files[0].name
@@ -435,45 +497,47 @@ class TestFileNaming:
         print(f"[OK] File named correctly: {filename}")
 
     def test_duplicate_filename_handling(self, temp_download_dir, update_queue, loaded_cookies):
-        """Test that duplicate downloads handle existing files
+        """Test that a repeat download of an existing file gets a _1 suffix
         
-        NOTE: yt-dlp by default overwrites existing files. The _generate_unique_filename
-        method exists but may not prevent all overwrites. This test documents the behavior.
+        Only the first download goes over the network; the second one is
+        checked by asking the uniqueness helper, with the same format, which
+        template and filename it would use.
         """
         test_url = "https://www.youtube.com/watch?v=jNQXAC9IVRw"
         
-        # Download same video twice
-        for i in range(2):
-            thread = DownloadThread(
-                url=test_url,
-                format_id="worst",
-                output_path=temp_download_dir,
-                update_queue=update_queue
-            )
-            
-            thread.start()
-            if thread.thread:
-                thread.thread.join(timeout=60.0)
-            
-            # Clear queue
-            while not update_queue.empty():
-                try:
-                    update_queue.get_nowait()
-                except queue.Empty:
-                    break
-        
-        # Check files created
-        video_files = list(Path(temp_download_dir).glob("*.*"))
-        
-        # yt-dlp may overwrite, so we might have 1 or 2 files depending on implementation
-        assert len(video_files) >= 1, f"Should have at least 1 file, found {len(video_files)}"
-        
-        if len(video_files) == 1:
-            print(f"[INFO] File was overwritten (yt-dlp default behavior): {video_files[0].name}")
-        else:
-            print(f"[OK] Unique files created:")
-            for f in video_files:
-                print(f"     - {f.name}")
+        thread = DownloadThread(
+            url=test_url,
+            format_id=FAST_FORMAT,
+            output_path=temp_download_dir,
+            update_queue=update_queue
+        )
+        
+        thread.start()
+        messages = _wait_for(update_queue, TERMINAL_MESSAGE_TYPES, 60.0)
+        finished = [m for m in messages if m.get("type") == "finished"]
+        assert finished, f"First download should finish. Messages: {messages}"
+        
+        video_files = _list_files(temp_download_dir)
+        assert len(video_files) == 1, f"Should have exactly 1 file, found {video_files}"
+        
+        # Resolve the filename a second download of the same video would use
+        base_template = os.path.join(temp_download_dir, "%(title)s [%(format_id)s].%(ext)s")
+        second = DownloadThread(
+            url=test_url,
+            format_id=FAST_FORMAT,
+            output_path=temp_download_dir,
+            update_queue=queue.Queue()
+        )
+        template, expected_filename = second._generate_unique_filename(base_template, FAST_FORMAT)
+        
+        assert expected_filename is not None, "Should resolve the second download's filename"
+        stem = os.path.splitext(os.path.basename(expected_filename))[0]
+        assert stem.endswith("_1"), f"Second download should get a _1 suffix: {expected_filename}"
+        assert "_1 [" in template, f"Template should carry the _1 suffix: {template}"
+        assert not os.path.exists(expected_filename)
+        
+        print(f"[OK] First file: {video_files[0].name}")
+        print(f"     Second download would write: {os.path.basename(expected_filename)}")
 
 
 if __name__ == "__main__":
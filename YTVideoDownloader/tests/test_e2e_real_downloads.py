@@ -19,12 +19,10 @@ These tests serve as documentation of how the download code works and can be run
 manually with fresh cookies to verify the download pipeline.
 
 Run with: pytest tests/test_e2e_real_downloads.py -v -s --tb=short
+Run in parallel with: pytest tests/test_e2e_real_downloads.py -n 4 -v --tb=short
 """
 
 import os
-import queue
-import shutil
-import tempfile
 import time
 from pathlib import Path
 
@@ -33,6 +31,7 @@ import pytest
 # Import the real download classes - no mocks
 from download_threads import DownloadThread
 from playlist_downloader import PlaylistDownloader
+from tests.conftest import CompletionQueue, drain_queue, first_file
 
 
 # Skip all tests if cookie file doesn't exist
@@ -42,44 +41,43 @@ pytestmark = pytest.mark.skipif(
     reason="youtube.com_cookies.txt not found - required for e2e tests"
 )
 
-
-@pytest.fixture
-def temp_download_dir():
-    """Create temporary directory for downloads"""
-    temp_dir = tempfile.mkdtemp(prefix="yt_e2e_test_")
-    yield temp_dir
-    # Cleanup after test
-    if os.path.exists(temp_dir):
-        try:
-            shutil.rmtree(temp_dir)
-        except Exception as e:
-            print(f"Warning: Could not clean up {temp_dir}: {e}")
+# Extensions yt-dlp produces for the formats these tests request
+VIDEO_EXTENSIONS = frozenset({".mp4", ".webm", ".mkv"})
 
 
 @pytest.fixture
 def update_queue():
     """Create queue for download updates"""
-    return queue.Queue()
+    return CompletionQueue()
+
+
+def _list_videos(directory):
+    """List downloaded video files in directory with a single directory read"""
+    return [f for f in Path(directory).iterdir() if f.suffix in VIDEO_EXTENSIONS]
+
+
+def _list_sized_videos(directory):
+    """List (name, size) for downloaded videos using scandir's cached stat"""
+    with os.scandir(directory) as entries:
+        return [
+            (e.name, e.stat().st_size)
+            for e in entries
+            if os.path.splitext(e.name)[1] in VIDEO_EXTENSIONS
+        ]
 
 
 class TestSingleVideoDownload:
     """End-to-end tests for single video downloads"""
 
-    def test_download_short_video_best_format(self, temp_download_dir, update_queue):
+    def test_download_short_video_best_format(self, temp_download_dir, update_queue, loaded_cookies):
         """Test downloading a short video with 'best' format"""
-        from cookie_manager import get_cookie_manager
-        
-        # Ensure cookies are loaded first
-        cookie_manager = get_cookie_manager()
-        cookie_manager.import_cookies_from_file(str(COOKIE_FILE))
-        
         # Use a short, publicly available video
         test_url = "https://www.youtube.com/watch?v=jNQXAC9IVRw"  # "Me at the zoo" - first YouTube video (18 seconds)
         
         # Create download thread
         thread = DownloadThread(
             url=test_url,
-            format_id="best",
+            format_id="best[height<=240]",  # best-format path, capped to keep the download small
             output_path=temp_download_dir,
             update_queue=update_queue
         )
@@ -87,48 +85,28 @@ class TestSingleVideoDownload:
         # Start download
         thread.start()
         
-        # Wait for completion (timeout after 60 seconds)
+        # Wait for the finished/error message (timeout after 60 seconds)
+        update_queue.done.wait(timeout=60.0)
         if thread.thread:
-            thread.thread.join(timeout=60.0)
+            thread.thread.join(timeout=5.0)
         
-        # Check results from queue
-        messages = []
-        while not update_queue.empty():
-            try:
-                msg = update_queue.get_nowait()
-                messages.append(msg)
-                print(f"Queue message: {msg}")
-            except queue.Empty:
-                break
-        
-        # Verify we got status messages
-        assert len(messages) > 0, "Should receive status messages"
-        
-        # Check for completion message
-        finished_messages = [m for m in messages if m.get("type") == "finished"]
-        assert len(finished_messages) > 0, "Should receive finished message"
+        # Check for completion message; the full queue is only drained on failure
+        terminal = update_queue.last_terminal
+        assert terminal is not None and terminal["type"] == "finished", \
+            f"Should receive finished message. Terminal: {terminal}, Messages: {drain_queue(update_queue)}"
         
         # Verify file was downloaded
-        downloaded_files = list(Path(temp_download_dir).glob("*.mp4")) + \
-                          list(Path(temp_download_dir).glob("*.webm")) + \
-                          list(Path(temp_download_dir).glob("*.mkv"))
+        downloaded_files = _list_sized_videos(temp_download_dir)
         
         assert len(downloaded_files) > 0, f"Should download at least one video file. Files in dir: {list(Path(temp_download_dir).iterdir())}"
         
         # Verify file is not empty
-        for file in downloaded_files:
-            file_size = file.stat().st_size
-            assert file_size > 1000, f"Downloaded file {file.name} should be larger than 1KB, got {file_size} bytes"
-            print(f"[OK] Downloaded: {file.name} ({file_size / 1024:.1f} KB)")
+        for name, file_size in downloaded_files:
+            assert file_size > 1000, f"Downloaded file {name} should be larger than 1KB, got {file_size} bytes"
+            print(f"[OK] Downloaded: {name} ({file_size / 1024:.1f} KB)")
 
-    def test_download_with_format_selection(self, temp_download_dir, update_queue):
+    def test_download_with_format_selection(self, temp_download_dir, update_queue, loaded_cookies):
         """Test downloading with specific format ID"""
-        from cookie_manager import get_cookie_manager
-        
-        # Ensure cookies are loaded first
-        cookie_manager = get_cookie_manager()
-        cookie_manager.import_cookies_from_file(str(COOKIE_FILE))
-        
         test_url = "https://www.youtube.com/watch?v=jNQXAC9IVRw"
         
         # Use "worst" which should always be available
@@ -140,68 +118,62 @@ class TestSingleVideoDownload:
         )
         
         thread.start()
+        update_queue.done.wait(timeout=60.0)
         if thread.thread:
-            thread.thread.join(timeout=60.0)
-        
-        # Collect messages
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
+            thread.thread.join(timeout=5.0)
         
         # Verify completion
-        finished = [m for m in messages if m.get("type") == "finished"]
-        assert len(finished) > 0, "Should complete download"
+        terminal = update_queue.last_terminal
+        assert terminal is not None and terminal["type"] == "finished", \
+            f"Should complete download. Terminal: {terminal}, Messages: {drain_queue(update_queue)}"
         
         # Verify file exists
-        video_files = list(Path(temp_download_dir).glob("*.*"))
-        assert len(video_files) > 0, "Should create video file"
+        assert first_file(temp_download_dir) is not None, "Should create video file"
 
-    def test_download_cancellation(self, temp_download_dir, update_queue):
-        """Test that download can be cancelled"""
-        from cookie_manager import get_cookie_manager
-        
-        # Ensure cookies are loaded first
-        cookie_manager = get_cookie_manager()
-        cookie_manager.import_cookies_from_file(str(COOKIE_FILE))
-        
-        # Use a longer video for cancellation test
-        test_url = "https://www.youtube.com/watch?v=9bZkp7q19f0"  # Gangnam Style (long video)
+    def test_download_cancellation(self, temp_download_dir, update_queue, loaded_cookies):
+        """Test that a download cancelled mid-transfer reports cancellation"""
+        # Throttle the short video so it is still downloading when we cancel,
+        # instead of pulling tens of MB of a long video at full speed
+        test_url = "https://www.youtube.com/watch?v=jNQXAC9IVRw"
         
         thread = DownloadThread(
             url=test_url,
             format_id="best",
             output_path=temp_download_dir,
-            update_queue=update_queue
+            update_queue=update_queue,
+            ratelimit=200_000  # bytes/s
         )
         
         thread.start()
         
-        # Wait a moment for download to start
-        time.sleep(2.0)
+        # Wait for the first progress message: only then is yt-dlp actually
+        # transferring data, so the cancel lands mid-download
+        messages = []
+        deadline = time.monotonic() + 30.0
+        while not any(m.get("type") == "progress" for m in messages):
+            remaining = deadline - time.monotonic()
+            assert remaining > 0, f"No progress before timeout. Messages: {messages}"
+            messages.append(update_queue.get(timeout=remaining))
         
         # Cancel the download
         thread.cancel()
         assert thread.cancelled is True, "Thread should be marked as cancelled"
         
-        # Wait for thread to stop
-        if thread.thread:
-            thread.thread.join(timeout=10.0)
-        
-        # Collect messages
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
+        # cancel() takes effect once the in-flight yt-dlp call returns, so
+        # allow for the rest of the throttled transfer
+        assert thread.wait_done(30.0), "Download thread did not stop after cancel"
         
-        # Should have received some messages before cancellation
-        assert len(messages) > 0, "Should receive messages before cancellation"
+        messages += drain_queue(update_queue)
         
-        print(f"[OK] Successfully cancelled download after {len(messages)} messages")
+        finished = [m for m in messages if m.get("type") == "finished"]
+        cancelled = [
+            m for m in messages
+            if m.get("type") == "status" and m.get("text") == "Download cancelled"
+        ]
+        assert not finished, f"Cancelled download must not report finished: {finished}"
+        assert cancelled, f"Should report the cancellation. Messages: {messages}"
+        
+        print(f"[OK] Cancelled mid-download after {len(messages)} messages")
 
 
 class TestPlaylistDownload:
@@ -235,15 +207,10 @@ class TestPlaylistDownload:
             downloader.thread.join(timeout=300.0)
         
         # Collect messages
-        messages = []
-        while not update_queue.empty():
-            try:
-                msg = update_queue.get_nowait()
-                messages.append(msg)
-                if msg.get("type") == "status":
-                    print(f"Status: {msg.get('text')}")
-            except queue.Empty:
-                break
+        messages = drain_queue(update_queue)
+        for msg in messages:
+            if msg.get("type") == "status":
+                print(f"Status: {msg.get('text')}")
         
         # Verify we got messages
         assert len(messages) > 0, "Should receive messages"
@@ -253,9 +220,7 @@ class TestPlaylistDownload:
         assert len(finished_messages) > 0, "Should complete playlist download"
         
         # Verify files were downloaded
-        video_files = list(Path(temp_download_dir).glob("*.mp4")) + \
-                     list(Path(temp_download_dir).glob("*.webm")) + \
-                     list(Path(temp_download_dir).glob("*.mkv"))
+        video_files = _list_videos(temp_download_dir)
         
         assert len(video_files) > 0, "Should download at least one video from playlist"
         
@@ -277,12 +242,7 @@ class TestPlaylistDownload:
             downloader.thread.join(timeout=300.0)
         
         # Collect messages
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
+        messages = drain_queue(update_queue)
         
         # Verify completion
         finished = [m for m in messages if m.get("type") == "finished"]
@@ -298,63 +258,47 @@ class TestPlaylistDownload:
 class TestCookieAuthentication:
     """Test that cookies are properly used for authentication"""
 
-    def test_cookies_are_loaded(self, temp_download_dir, update_queue):
+    def test_cookies_are_loaded(self, loaded_cookies):
         """Verify that the cookie file is loaded and used"""
-        from cookie_manager import get_cookie_manager
-        
-        cookie_manager = get_cookie_manager()
-        assert cookie_manager is not None, "Cookie manager should be available"
-        
-        # Import cookies from file
-        success = cookie_manager.import_cookies_from_file(str(COOKIE_FILE))
-        assert success, f"Should successfully import cookies from {COOKIE_FILE}"
+        # loaded_cookies already asserted that the import succeeded
+        assert loaded_cookies is not None, "Cookie manager should be available"
         
         # Get cookies for yt-dlp
-        cookie_data = cookie_manager.get_cookies_for_ytdlp_enhanced()
+        cookie_data = loaded_cookies.get_cookies_for_ytdlp_enhanced()
         assert cookie_data is not None, "Should get cookie data"
         assert cookie_data.get("source") in ["manual_import", "cookies_from_browser", "auto_extracted"], \
             f"Cookie source should be valid, got: {cookie_data.get('source')}"
         
         print(f"[OK] Cookies loaded successfully, source: {cookie_data.get('source')}")
 
-    def test_download_with_authentication(self, temp_download_dir, update_queue):
+    def test_download_with_authentication(self, temp_download_dir, update_queue, loaded_cookies):
         """Test that downloads work with authentication"""
-        from cookie_manager import get_cookie_manager
-        
-        # Ensure cookies are loaded
-        cookie_manager = get_cookie_manager()
-        cookie_manager.import_cookies_from_file(str(COOKIE_FILE))
-        
         # Try downloading a video (should use cookies automatically)
         test_url = "https://www.youtube.com/watch?v=jNQXAC9IVRw"
         
         thread = DownloadThread(
             url=test_url,
-            format_id="best",
+            format_id="worst",  # smallest file; only auth success matters here
             output_path=temp_download_dir,
             update_queue=update_queue
         )
         
         thread.start()
+        update_queue.done.wait(timeout=60.0)
         if thread.thread:
-            thread.thread.join(timeout=60.0)
+            thread.thread.join(timeout=5.0)
         
-        # Collect messages
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
+        terminal = update_queue.last_terminal or {}
         
-        # Should succeed
-        finished = [m for m in messages if m.get("type") == "finished"]
-        assert len(finished) > 0, "Download should complete with authentication"
+        # Should not have authentication errors (checked first for a clearer failure)
+        if terminal.get("type") == "error":
+            text = str(terminal).lower()
+            assert "bot" not in text and "sign in" not in text, \
+                f"Should not have authentication errors: {terminal}"
         
-        # Should not have authentication errors
-        error_messages = [m for m in messages if m.get("type") == "error"]
-        auth_errors = [m for m in error_messages if "bot" in str(m).lower() or "sign in" in str(m).lower()]
-        assert len(auth_errors) == 0, f"Should not have authentication errors: {auth_errors}"
+        # Should succeed
+        assert terminal.get("type") == "finished", \
+            f"Download should complete with authentication. Terminal: {terminal}, Messages: {drain_queue(update_queue)}"
         
         print("[OK] Download completed successfully with authentication")
 
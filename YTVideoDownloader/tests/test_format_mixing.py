@@ -5,12 +5,11 @@ Pytest-style tests for audio-video format mixing functionality
 Tests format mixing logic without any GUI creation or user interaction.
 """
 
-import queue
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import pytest
 
-from download_threads import DownloadThread
+from download_threads import _build_format_string
 
 
 @pytest.fixture
@@ -25,17 +24,11 @@ def test_output_path():
     return "/tmp"
 
 
-@pytest.fixture
-def update_queue():
-    """Provide update queue"""
-    return queue.Queue()
-
-
 def test_download_thread_with_manual_format_selection(
-    test_url, test_output_path, update_queue
+    test_url, test_output_path, update_queue, download_thread_cls
 ):
     """Test DownloadThread with manual video and audio format selection"""
-    thread = DownloadThread(
+    thread = download_thread_cls(
         url=test_url,
         format_id=None,
         output_path=test_output_path,
@@ -50,10 +43,10 @@ def test_download_thread_with_manual_format_selection(
 
 
 def test_download_thread_with_automatic_format_selection(
-    test_url, test_output_path, update_queue
+    test_url, test_output_path, update_queue, download_thread_cls
 ):
     """Test DownloadThread with automatic format selection"""
-    thread = DownloadThread(
+    thread = download_thread_cls(
         url=test_url,
         format_id="best",
         output_path=test_output_path,
@@ -67,80 +60,32 @@ def test_download_thread_with_automatic_format_selection(
     assert thread.audio_format_id is None
 
 
-def test_format_string_construction_manual_selection(
-    test_url, test_output_path, update_queue
-):
+def test_format_string_construction_manual_selection():
     """Test that format string is correctly constructed for manual selection"""
-    with (
-        patch("download_threads.check_ffmpeg", return_value=True),
-        patch("download_threads.yt_dlp.YoutubeDL") as mock_ytdl,
-    ):
-        mock_ytdl_instance = Mock()
-        mock_ytdl.return_value.__enter__.return_value = mock_ytdl_instance
-        mock_ytdl.return_value.__exit__.return_value = None
-
-        thread = DownloadThread(
-            url=test_url,
-            format_id=None,
-            output_path=test_output_path,
-            update_queue=update_queue,
-            video_format_id="137",
-            audio_format_id="140",
-        )
-
-        thread.run()
-
-        mock_ytdl.assert_called()
-        call_args = mock_ytdl.call_args
-
-        if call_args and len(call_args) > 0:
-            ydl_opts = call_args[0][0] if call_args[0] else {}
-            if isinstance(ydl_opts, dict) and "format" in ydl_opts:
-                assert ydl_opts["format"] == "137+140"
+    assert _build_format_string("137", "140", None) == "137+140"
 
 
-def test_format_string_construction_automatic_selection(
-    test_url, test_output_path, update_queue
-):
+def test_format_string_construction_automatic_selection():
     """Test that format string is correctly constructed for automatic selection"""
-    with (
-        patch("download_threads.check_ffmpeg", return_value=True),
-        patch("download_threads.yt_dlp.YoutubeDL") as mock_ytdl,
-    ):
-        mock_ytdl_instance = Mock()
-        mock_ytdl.return_value.__enter__.return_value = mock_ytdl_instance
-        mock_ytdl.return_value.__exit__.return_value = None
-
-        thread = DownloadThread(
-            url=test_url,
-            format_id="best",
-            output_path=test_output_path,
-            update_queue=update_queue,
-        )
+    assert _build_format_string(None, None, "best") == "best"
+    # A lone manual pick falls back to the automatic format
+    assert _build_format_string("137", None, "best") == "best"
 
-        thread.run()
 
-        mock_ytdl.assert_called()
+def test_mixed_format_fallback_logic(
+    test_url, test_output_path, update_queue, patched_ydl, download_thread_cls
+):
+    """Test fallback logic when mixed format fails"""
+    _, mock_ytdl_instance = patched_ydl
 
+    # First call fails, subsequent calls succeed
+    mock_ytdl_instance.download.side_effect = [
+        Exception("Format not available"),
+        None,  # Second format succeeds
+    ]
 
-def test_mixed_format_fallback_logic(test_url, test_output_path, update_queue):
-    """Test fallback logic when mixed format fails"""
-    with (
-        patch("download_threads.check_ffmpeg", return_value=True),
-        patch("download_threads.yt_dlp.YoutubeDL") as mock_ytdl,
-    ):
-        mock_ytdl_instance = Mock()
-
-        # First call fails, subsequent calls succeed
-        mock_ytdl_instance.download.side_effect = [
-            Exception("Format not available"),
-            None,  # Second format succeeds
-        ]
-
-        mock_ytdl.return_value.__enter__.return_value = mock_ytdl_instance
-        mock_ytdl.return_value.__exit__.return_value = None
-
-        thread = DownloadThread(
+    with patch("download_threads.check_ffmpeg", return_value=True):
+        thread = download_thread_cls(
             url=test_url,
             format_id=None,
             output_path=test_output_path,
@@ -152,4 +97,4 @@ def test_mixed_format_fallback_logic(test_url, test_output_path, update_queue):
         thread.run()
 
         # Should have tried multiple formats
-        assert mock_ytdl_instance.download.call_count >= 1
+        assert len(mock_ytdl_instance.download.call_args_list) >= 1
@@ -4,119 +4,72 @@ Pytest-style tests for playlist functionality in the YouTube Video Downloader.
 Tests playlist URL detection, normalization, download scenarios, error handling, and progress tracking.
 """
 
-import os
-import queue
-import shutil
-import tempfile
-from unittest.mock import Mock, patch
+from utils import is_playlist_url, normalize_playlist_url
 
-import pytest
 
-from download_threads import DownloadThread
-from utils import is_playlist_url, normalize_playlist_url
+# Ceiling for joining the mocked download thread; join() returns as soon as
+# the worker exits, so this only matters on slow or loaded (xdist) workers
+_JOIN_TIMEOUT = 5.0
 
 
-@pytest.mark.parametrize(
-    "url",
-    [
-        "https://www.youtube.com/playlist?list=PL123456789",
-        "https://www.youtube.com/watch?v=abc123&list=PL123456789",
-        "https://www.youtube.com/watch?list=PL123456789&v=abc123",
-        "https://www.youtube.com/user/username/playlists",
-        "https://www.youtube.com/channel/UC123456789/playlists",
-    ],
+# URL tables are checked in a loop by one test each; the assertion message
+# names the failing URL, so per-case parametrization is not needed
+_PLAYLIST_URLS = (
+    "https://www.youtube.com/playlist?list=PL123456789",
+    "https://www.youtube.com/watch?v=abc123&list=PL123456789",
+    "https://www.youtube.com/watch?list=PL123456789&v=abc123",
+    "https://www.youtube.com/user/username/playlists",
+    "https://www.youtube.com/channel/UC123456789/playlists",
 )
-def test_playlist_url_detection(url):
-    """Test playlist URL detection"""
-    assert (
-        is_playlist_url(url) is True
-    ), f"Expected {url} to be identified as a playlist URL"
-
-
-@pytest.mark.parametrize(
-    "url",
-    [
-        "https://www.youtube.com/watch?v=abc123",
-        "https://www.vimeo.com/123456",
-        "https://example.com/video.mp4",
-    ],
-)
-def test_non_playlist_url_detection(url):
-    """Test that non-playlist URLs are correctly identified"""
-    assert (
-        is_playlist_url(url) is False
-    ), f"Expected {url} to NOT be identified as a playlist URL"
-
-
-@pytest.mark.parametrize(
-    "original,expected",
-    [
-        (
-            "https://www.youtube.com/watch?v=abc123&list=PL123456789",
-            "https://www.youtube.com/playlist?list=PL123456789",
-        ),
-        (
-            "https://www.youtube.com/watch?list=PL123456789&v=abc123",
-            "https://www.youtube.com/playlist?list=PL123456789",
-        ),
-        (
-            "https://www.youtube.com/playlist?list=PL123456789",
-            "https://www.youtube.com/playlist?list=PL123456789",
-        ),
-        (
-            "https://www.youtube.com/watch?v=aLYrV61rJG4&list=PLIivdWyY5sqLXR1eSkiM5bE6pFlXC-OSs&index=5",
-            "https://www.youtube.com/playlist?list=PLIivdWyY5sqLXR1eSkiM5bE6pFlXC-OSs",
-        ),
-        (
-            "https://www.youtube.com/watch?list=PL123456789&v=abc123&index=10&t=100",
-            "https://www.youtube.com/playlist?list=PL123456789",
-        ),
-        (
-            "https://www.youtube.com/playlist?list=PL123456789&index=5",
-            "https://www.youtube.com/playlist?list=PL123456789",
-        ),
-        (
-            "https://www.youtube.com/watch?v=test&list=PLtest&index=3&t=100&feature=shared",
-            "https://www.youtube.com/playlist?list=PLtest",
-        ),
-    ],
+
+_NON_PLAYLIST_URLS = (
+    "https://www.youtube.com/watch?v=abc123",
+    "https://www.vimeo.com/123456",
+    "https://example.com/video.mp4",
 )
-def test_url_normalization(original, expected):
-    """Test URL normalization"""
-    result = normalize_playlist_url(original)
-    assert (
-        result == expected
-    ), f"Normalization failed for {original}. Expected: {expected}, Got: {result}"
 
+# original URL -> expected normalized playlist URL
+_NORMALIZED_URLS = {
+    "https://www.youtube.com/watch?v=abc123&list=PL123456789": "https://www.youtube.com/playlist?list=PL123456789",
+    "https://www.youtube.com/watch?list=PL123456789&v=abc123": "https://www.youtube.com/playlist?list=PL123456789",
+    "https://www.youtube.com/playlist?list=PL123456789": "https://www.youtube.com/playlist?list=PL123456789",
+    "https://www.youtube.com/watch?v=aLYrV61rJG4&list=PLIivdWyY5sqLXR1eSkiM5bE6pFlXC-OSs&index=5": "https://www.youtube.com/playlist?list=PLIivdWyY5sqLXR1eSkiM5bE6pFlXC-OSs",
+    "https://www.youtube.com/watch?list=PL123456789&v=abc123&index=10&t=100": "https://www.youtube.com/playlist?list=PL123456789",
+    "https://www.youtube.com/playlist?list=PL123456789&index=5": "https://www.youtube.com/playlist?list=PL123456789",
+    "https://www.youtube.com/watch?v=test&list=PLtest&index=3&t=100&feature=shared": "https://www.youtube.com/playlist?list=PLtest",
+}
 
-@pytest.fixture
-def temp_dir():
-    """Provide temporary directory"""
-    temp = tempfile.mkdtemp()
-    yield temp
-    if os.path.exists(temp):
-        shutil.rmtree(temp)
 
+def test_playlist_url_detection():
+    """Test playlist URL detection"""
+    for url in _PLAYLIST_URLS:
+        assert (
+            is_playlist_url(url) is True
+        ), f"Expected {url} to be identified as a playlist URL"
 
-@pytest.fixture
-def update_queue():
-    """Provide update queue"""
-    return queue.Queue()
 
+def test_non_playlist_url_detection():
+    """Test that non-playlist URLs are correctly identified"""
+    for url in _NON_PLAYLIST_URLS:
+        assert (
+            is_playlist_url(url) is False
+        ), f"Expected {url} to NOT be identified as a playlist URL"
 
-@pytest.fixture
-def sample_video_urls():
-    """Provide sample video URLs"""
-    return [
-        "https://www.youtube.com/watch?v=video1",
-        "https://www.youtube.com/watch?v=video2",
-        "https://www.youtube.com/watch?v=video3",
-    ]
 
+def test_url_normalization():
+    """Test URL normalization"""
+    for original, expected in _NORMALIZED_URLS.items():
+        result = normalize_playlist_url(original)
+        assert (
+            result == expected
+        ), f"Normalization failed for {original}. Expected: {expected}, Got: {result}"
 
-def test_download_thread_initialization(temp_dir, update_queue, sample_video_urls):
+
+def test_download_thread_initialization(
+    temp_dir, update_queue, sample_video_urls, download_thread_cls
+):
     """Test DownloadThread initialization with valid parameters"""
-    thread = DownloadThread(
+    thread = download_thread_cls(
         url=sample_video_urls[0],
         format_id="best",
         output_path=temp_dir,
@@ -131,9 +84,11 @@ def test_download_thread_initialization(temp_dir, update_queue, sample_video_url
     assert thread.cancelled is False
 
 
-def test_download_thread_cancel(temp_dir, update_queue, sample_video_urls):
+def test_download_thread_cancel(
+    temp_dir, update_queue, sample_video_urls, download_thread_cls
+):
     """Test download thread cancellation functionality"""
-    thread = DownloadThread(
+    thread = download_thread_cls(
         url=sample_video_urls[0],
         format_id="best",
         output_path=temp_dir,
@@ -145,31 +100,24 @@ def test_download_thread_cancel(temp_dir, update_queue, sample_video_urls):
     assert thread.cancelled is True
 
 
-def test_successful_download_scenario(temp_dir, update_queue, sample_video_urls):
+def test_successful_download_scenario(
+    temp_dir, update_queue, sample_video_urls, patched_ydl, download_thread_cls
+):
     """Test successful download scenario with progress tracking"""
-    with patch("download_threads.yt_dlp.YoutubeDL") as mock_ydl_class:
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.download.return_value = None
-
-        thread = DownloadThread(
-            url=sample_video_urls[0],
-            format_id="best",
-            output_path=temp_dir,
-            update_queue=update_queue,
-        )
-
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=5.0)
-
-        assert mock_ydl.download.called
-
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
-
-        assert len(messages) > 0
+    _, mock_ydl = patched_ydl
+    mock_ydl.download.return_value = None
+
+    thread = download_thread_cls(
+        url=sample_video_urls[0],
+        format_id="best",
+        output_path=temp_dir,
+        update_queue=update_queue,
+    )
+
+    thread.start()
+    if thread.thread:
+        thread.thread.join(timeout=_JOIN_TIMEOUT)
+        assert not thread.thread.is_alive(), "download thread did not terminate"
+
+    assert mock_ydl.download.call_args_list
+    assert not update_queue.empty()
@@ -4,221 +4,143 @@ Pytest-style tests for playlist download error handling and recovery.
 Tests various error conditions, network failures, and recovery mechanisms.
 """
 
-import os
 import queue
-import shutil
-import tempfile
-import time
-from unittest.mock import Mock, patch
+import re
+import threading
 
 import pytest
 
-from download_threads import DownloadThread
 
-
-@pytest.fixture
-def temp_dir():
-    """Provide temporary directory"""
-    temp = tempfile.mkdtemp()
-    yield temp
-    if os.path.exists(temp):
-        shutil.rmtree(temp)
-
-
-@pytest.fixture
-def update_queue():
-    """Provide update queue"""
-    return queue.Queue()
-
-
-@pytest.fixture
-def sample_video_urls():
-    """Provide sample video URLs"""
-    return [
-        "https://www.youtube.com/watch?v=video1",
-        "https://www.youtube.com/watch?v=video2",
-        "https://www.youtube.com/watch?v=video3",
-    ]
+# Ceiling for joining the mocked download thread; join() returns as soon as
+# the worker exits, so this only matters on slow or loaded (xdist) workers
+_JOIN_TIMEOUT = 5.0
 
 
 def get_queue_messages(queue_obj):
-    """Helper to get all messages from queue"""
-    messages = []
-    while not queue_obj.empty():
+    """Helper to yield all messages from queue
+
+    Callers have already joined the producer thread, so draining with
+    get_nowait() sees every message without blocking.
+    """
+    while True:
         try:
-            messages.append(queue_obj.get_nowait())
+            yield queue_obj.get_nowait()
         except queue.Empty:
-            break
-    return messages
-
-
-def test_network_connection_error(temp_dir, update_queue, sample_video_urls):
-    """Test handling of network connection errors"""
-    with patch("download_threads.yt_dlp.YoutubeDL") as mock_ydl_class:
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.download.side_effect = Exception("Network is unreachable")
-
-        thread = DownloadThread(
-            url=sample_video_urls[0],
-            format_id="best",
-            output_path=temp_dir,
-            update_queue=update_queue,
-        )
-
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=10.0)
-
-        assert mock_ydl.download.call_count > 1
-
-        messages = get_queue_messages(update_queue)
-        error_messages = [msg for msg in messages if msg.get("type") == "error"]
-        assert len(error_messages) > 0
-
-
-def test_http_403_forbidden_error(temp_dir, update_queue, sample_video_urls):
-    """Test handling of HTTP 403 Forbidden errors"""
-    with patch("download_threads.yt_dlp.YoutubeDL") as mock_ydl_class:
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-
-        error_403 = Exception("HTTP Error 403: Forbidden")
-        mock_ydl.download.side_effect = error_403
-
-        thread = DownloadThread(
-            url=sample_video_urls[0],
-            format_id="best",
-            output_path=temp_dir,
-            update_queue=update_queue,
-        )
-
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=10.0)
-
-        messages = get_queue_messages(update_queue)
-        error_messages = [msg for msg in messages if msg.get("type") == "error"]
-
-        auth_error_found = any(
-            "403" in str(msg.get("text", ""))
-            or "forbidden" in str(msg.get("text", "")).lower()
-            for msg in error_messages
-        )
-        assert auth_error_found, "Expected 403/Forbidden error message not found"
-
-
-def test_video_unavailable_error(temp_dir, update_queue, sample_video_urls):
-    """Test handling of unavailable video errors"""
-    with patch("download_threads.yt_dlp.YoutubeDL") as mock_ydl_class:
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-
-        mock_ydl.download.side_effect = Exception("Video unavailable")
-
-        thread = DownloadThread(
-            url=sample_video_urls[0],
-            format_id="best",
-            output_path=temp_dir,
-            update_queue=update_queue,
-        )
-
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=10.0)
-
-        messages = get_queue_messages(update_queue)
-        error_messages = [msg for msg in messages if msg.get("type") == "error"]
-
-        unavailable_error_found = any(
-            "unavailable" in str(msg.get("text", "")).lower() for msg in error_messages
-        )
-        assert unavailable_error_found, "Expected 'unavailable' error message not found"
-
-
-def test_cancellation_during_download(temp_dir, update_queue, sample_video_urls):
+            return
+
+
+# Case-insensitive matchers for the reported error text
+_NETWORK_ERR_RE = re.compile(r"network", re.IGNORECASE)
+_FORBIDDEN_ERR_RE = re.compile(r"403|forbidden", re.IGNORECASE)
+_UNAVAILABLE_ERR_RE = re.compile(r"unavailable", re.IGNORECASE)
+
+
+@pytest.mark.parametrize(
+    "exc_text,expected_re",
+    [
+        ("Network is unreachable", _NETWORK_ERR_RE),
+        ("HTTP Error 403: Forbidden", _FORBIDDEN_ERR_RE),
+        ("Video unavailable", _UNAVAILABLE_ERR_RE),
+    ],
+    ids=["network", "http_403", "unavailable"],
+)
+def test_error_handling(
+    temp_dir,
+    update_queue,
+    sample_video_urls,
+    patched_ydl,
+    exc_text,
+    expected_re,
+    download_thread_cls,
+):
+    """Test that download errors fall back across formats and are reported"""
+    _, mock_ydl = patched_ydl
+    mock_ydl.download.side_effect = Exception(exc_text)
+
+    thread = download_thread_cls(
+        url=sample_video_urls[0],
+        format_id="best",
+        output_path=temp_dir,
+        update_queue=update_queue,
+    )
+
+    thread.start()
+    if thread.thread:
+        thread.thread.join(timeout=_JOIN_TIMEOUT)
+        assert not thread.thread.is_alive(), "download thread did not terminate"
+
+    # Should have tried multiple formats before giving up
+    assert len(mock_ydl.download.call_args_list) >= 2
+
+    messages = get_queue_messages(update_queue)
+    error_messages = [msg for msg in messages if msg.get("type") == "error"]
+    assert any(
+        expected_re.search(str(msg.get("text", ""))) for msg in error_messages
+    ), f"Expected error message matching {expected_re.pattern!r} not found"
+
+
+def test_cancellation_during_download(
+    temp_dir, update_queue, sample_video_urls, patched_ydl, download_thread_cls
+):
     """Test cancellation while download is in progress"""
-    with patch("download_threads.yt_dlp.YoutubeDL") as mock_ydl_class:
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-
-        def slow_failing_download(url_list):
-            time.sleep(0.5)
-            raise Exception("Slow network error")
-
-        mock_ydl.download.side_effect = slow_failing_download
-
-        thread = DownloadThread(
-            url=sample_video_urls[0],
-            format_id="best",
-            output_path=temp_dir,
-            update_queue=update_queue,
-        )
-
-        thread.start()
-
-        time.sleep(0.2)
-        thread.cancel()
+    _, mock_ydl = patched_ydl
 
-        if thread.thread:
-            thread.thread.join(timeout=5.0)
+    started = threading.Event()
+    proceed = threading.Event()
 
-        assert thread.cancelled is True
+    def slow_failing_download(url_list):
+        # Hold the download open until the test has cancelled
+        started.set()
+        proceed.wait(timeout=5.0)
+        raise Exception("Slow network error")
 
+    mock_ydl.download.side_effect = slow_failing_download
 
-def test_multiple_format_attempts_on_error(temp_dir, update_queue, sample_video_urls):
-    """Test that multiple formats are attempted when one fails"""
-    with patch("download_threads.yt_dlp.YoutubeDL") as mock_ydl_class:
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
+    thread = download_thread_cls(
+        url=sample_video_urls[0],
+        format_id="best",
+        output_path=temp_dir,
+        update_queue=update_queue,
+    )
 
-        # Fail multiple times to trigger fallback attempts
-        mock_ydl.download.side_effect = [
-            Exception("Format 1 failed"),
-            Exception("Format 2 failed"),
-            Exception("Format 3 failed"),
-        ]
+    thread.start()
 
-        thread = DownloadThread(
-            url=sample_video_urls[0],
-            format_id="best",
-            output_path=temp_dir,
-            update_queue=update_queue,
-        )
+    assert started.wait(timeout=2.0), "download never started"
+    thread.cancel()
+    proceed.set()
 
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=10.0)
+    if thread.thread:
+        thread.thread.join(timeout=_JOIN_TIMEOUT)
+        assert not thread.thread.is_alive(), "download thread did not terminate"
 
-        # Should have tried multiple formats (at least 2)
-        assert mock_ydl.download.call_count >= 2
+    assert thread.cancelled is True
 
 
-def test_error_message_queue_format(temp_dir, update_queue, sample_video_urls):
+def test_error_message_queue_format(
+    temp_dir, update_queue, sample_video_urls, patched_ydl, download_thread_cls
+):
     """Test that error messages are properly formatted in the queue"""
-    with patch("download_threads.yt_dlp.YoutubeDL") as mock_ydl_class:
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-
-        test_error = "Test error message"
-        mock_ydl.download.side_effect = Exception(test_error)
-
-        thread = DownloadThread(
-            url=sample_video_urls[0],
-            format_id="best",
-            output_path=temp_dir,
-            update_queue=update_queue,
-        )
-
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=10.0)
-
-        messages = get_queue_messages(update_queue)
-        error_messages = [msg for msg in messages if msg.get("type") == "error"]
-
-        assert len(error_messages) > 0
-        for msg in error_messages:
-            assert "type" in msg
+    _, mock_ydl = patched_ydl
+
+    test_error = "Test error message"
+    mock_ydl.download.side_effect = Exception(test_error)
+
+    thread = download_thread_cls(
+        url=sample_video_urls[0],
+        format_id="best",
+        output_path=temp_dir,
+        update_queue=update_queue,
+    )
+
+    thread.start()
+    if thread.thread:
+        thread.thread.join(timeout=_JOIN_TIMEOUT)
+        assert not thread.thread.is_alive(), "download thread did not terminate"
+
+    # Single pass over the queue: check each error message as it is found
+    found_error = False
+    for msg in get_queue_messages(update_queue):
+        if msg.get("type") == "error":
             assert "text" in msg
-            assert msg["type"] == "error"
+            found_error = True
+    assert found_error
@@ -9,69 +9,103 @@ format selection feature works for all possible combinations.
 Test Playlist: https://www.youtube.com/watch?v=LXeSNISmTgQ&list=PLeCPCQfHe9emt_AIVU_QBdxnQpVMZV6hg
 
 Run with: pytest tests/test_random_format_combinations.py -v -s
+Run in parallel with: pytest tests/test_random_format_combinations.py -n auto -v
 """
 
-import os
 import queue
 import random
-import shutil
-import tempfile
+import time
 from pathlib import Path
 
 import pytest
-import yt_dlp
 
-from cookie_manager import get_cookie_manager
-from download_threads import DownloadThread
-from playlist_downloader import PlaylistVideoDownloader
-from utils import normalize_playlist_url
 
-
-# Skip all tests if cookie file doesn't exist
+# Skip the whole module if cookie file doesn't exist; this runs before the
+# yt_dlp and downloader imports so offline runs never load them
 COOKIE_FILE = Path(__file__).parent.parent / "youtube.com_cookies.txt"
-pytestmark = pytest.mark.skipif(
-    not COOKIE_FILE.exists(),
-    reason="youtube.com_cookies.txt not found"
-)
+COOKIE_FILE_EXISTS = COOKIE_FILE.exists()
+if not COOKIE_FILE_EXISTS:
+    pytest.skip("youtube.com_cookies.txt not found", allow_module_level=True)
+
+yt_dlp = pytest.importorskip("yt_dlp")
+
+# Deliberately after the module-level skip: these import yt_dlp as well
+from download_threads import DownloadThread  # noqa: E402
+from playlist_downloader import PlaylistVideoDownloader  # noqa: E402
+from tests.conftest import drain_queue, first_file  # noqa: E402
+from utils import normalize_playlist_url  # noqa: E402
+
 
 # Test URLs
 TEST_VIDEO_URL = "https://www.youtube.com/watch?v=LXeSNISmTgQ"
 TEST_PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLeCPCQfHe9emt_AIVU_QBdxnQpVMZV6hg"
 
+# pytest cache entry for the extracted formats and how long it stays fresh (seconds)
+FORMATS_CACHE_KEY = "random_format_combinations/available_formats"
+FORMATS_CACHE_TTL = 3600
 
-@pytest.fixture
-def temp_download_dir():
-    """Create temporary directory for downloads"""
-    temp_dir = tempfile.mkdtemp(prefix="random_fmt_")
-    yield temp_dir
-    if os.path.exists(temp_dir):
-        try:
-            shutil.rmtree(temp_dir)
-        except Exception as e:
-            print(f"Warning: Could not clean up {temp_dir}: {e}")
+# Seeds for the random combination tests (single video and playlist)
+SINGLE_VIDEO_SEEDS = (1, 2, 3, 4, 5)
+PLAYLIST_SEEDS = (10, 20, 30)
 
+# Terminal message types sent by DownloadThread and PlaylistVideoDownloader
+FINISHED_TYPES = frozenset({"finished", "playlist_video_finished"})
+ERROR_TYPES = frozenset({"error", "playlist_video_error"})
 
-@pytest.fixture
-def update_queue():
-    """Create queue for download updates"""
-    return queue.Queue()
+# Container preferences for the mixed-container edge case
+_PREFERRED_VIDEO_EXTS = frozenset({"mp4"})
+_PREFERRED_AUDIO_EXTS = frozenset({"webm", "opus"})
 
 
 @pytest.fixture
-def loaded_cookies():
-    """Ensure cookies are loaded"""
-    cookie_manager = get_cookie_manager()
-    success = cookie_manager.import_cookies_from_file(str(COOKIE_FILE))
-    assert success, "Failed to load cookies"
-    return cookie_manager
-
-
-@pytest.fixture(scope="module")
-def available_formats():
-    """Extract all available formats once for the module"""
-    cookie_manager = get_cookie_manager()
-    cookie_manager.import_cookies_from_file(str(COOKIE_FILE))
+def update_queue():
+    """Create queue for download updates
+    
+    The downloaders only ever put() onto it, so the lighter SimpleQueue
+    is enough.
+    """
+    return queue.SimpleQueue()
+
+
+def _partition(messages):
+    """Split messages into (finished, errors) lists in a single pass"""
+    finished, errors = [], []
+    for m in messages:
+        msg_type = m.get("type")
+        if msg_type in FINISHED_TYPES:
+            finished.append(m)
+        elif msg_type in ERROR_TYPES:
+            errors.append(m)
+    return finished, errors
+
+
+def _run_and_verify(worker, update_queue, tmp_path, timeout=90.0):
+    """Start a download, wait for it and check it finished with an output file
+    
+    Works for both DownloadThread and PlaylistVideoDownloader; the latter
+    also counts as finished when its success flag is set. Returns the
+    drained messages and the DirEntry of the downloaded file.
+    """
+    worker.start()
+    if worker.thread:
+        worker.thread.join(timeout=timeout)
+    
+    messages = drain_queue(update_queue)
+    finished, errors = _partition(messages)
+    
+    if errors:
+        print(f"[ERROR] Download errors: {[e.get('text') for e in errors]}")
+    
+    assert finished or getattr(worker, "success", False), \
+        f"Download did not complete. Errors: {errors}"
     
+    entry = first_file(tmp_path)
+    assert entry is not None, "Should create output file"
+    return messages, entry
+
+
+def _extract_formats(cookie_manager):
+    """Extract TEST_VIDEO_URL and split its formats into video-only and audio-only"""
     ydl_opts = {"quiet": True, "no_warnings": True}
     from utils import setup_ytdlp_cookies
     setup_ytdlp_cookies(ydl_opts, cookie_manager, TEST_VIDEO_URL, None, "test")
@@ -110,44 +144,74 @@ def available_formats():
     return {
         "video": video_formats,
         "audio": audio_formats,
-        "video_url": TEST_VIDEO_URL
+        "video_url": TEST_VIDEO_URL,
+        "info": info
     }
 
 
-class TestSingleVideoRandomCombinations:
-    """Test random video+audio format combinations for single videos"""
-
-    def test_random_combination_1(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
-        """Test random video+audio combination #1"""
-        self._test_random_combination(temp_download_dir, update_queue, available_formats, seed=1)
-
-    def test_random_combination_2(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
-        """Test random video+audio combination #2"""
-        self._test_random_combination(temp_download_dir, update_queue, available_formats, seed=2)
+@pytest.fixture(scope="session")
+def available_formats(request, loaded_cookies):
+    """Extract all available formats once per session
+    
+    The result is also kept in pytest's cache (.pytest_cache) for up to an
+    hour, so repeated local runs skip the extract_info() round-trip. Run
+    with --cache-clear to force a fresh extraction. Depending on
+    loaded_cookies also gives every test that uses this fixture the
+    imported session cookies without requesting them itself.
+    """
+    formats = None
+    cache = getattr(request.config, "cache", None)
+    if cache is not None:
+        cached = cache.get(FORMATS_CACHE_KEY, None)
+        # Entries from before the info dict was cached count as misses
+        if (cached and time.time() - cached.get("saved_at", 0) < FORMATS_CACHE_TTL
+                and "info" in cached["formats"]):
+            formats = cached["formats"]
+    
+    if formats is None:
+        formats = _extract_formats(loaded_cookies)
+        # JSON-safe copy (as for --load-info-json) so a cache hit preloads the
+        # same info dict as a cold run; signed format URLs outlive the TTL
+        formats["info"] = yt_dlp.YoutubeDL.sanitize_info(formats["info"])
+        if cache is not None:
+            cache.set(FORMATS_CACHE_KEY, {"saved_at": time.time(), "formats": formats})
+    
+    # Every test below needs at least one of each, so skip them all up front
+    if not formats["video"] or not formats["audio"]:
+        pytest.skip("no usable video-only/audio-only formats for video")
+    
+    # Sorted views for the edge-case pickers, built once instead of per test
+    formats["video_by_height"] = sorted(formats["video"], key=lambda f: f.get("height") or 0)
+    formats["audio_by_abr"] = sorted(formats["audio"], key=lambda f: f.get("abr") or 0)
+    # Fall back to the full sorted list so the pickers can index [0] unguarded
+    formats["video_nonzero"] = [f for f in formats["video_by_height"] if (f.get("height") or 0) > 0] \
+        or formats["video_by_height"]
+    formats["audio_nonzero"] = [f for f in formats["audio_by_abr"] if (f.get("abr") or 0) > 0] \
+        or formats["audio_by_abr"]
+    
+    # seed -> (video_fmt, audio_fmt); a local Random per seed leaves the
+    # global random state alone
+    formats["seeded_picks"] = {}
+    for seed in SINGLE_VIDEO_SEEDS + PLAYLIST_SEEDS:
+        rng = random.Random(seed)
+        formats["seeded_picks"][seed] = (rng.choice(formats["video"]), rng.choice(formats["audio"]))
+    return formats
 
-    def test_random_combination_3(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
-        """Test random video+audio combination #3"""
-        self._test_random_combination(temp_download_dir, update_queue, available_formats, seed=3)
 
-    def test_random_combination_4(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
-        """Test random video+audio combination #4"""
-        self._test_random_combination(temp_download_dir, update_queue, available_formats, seed=4)
+class TestSingleVideoRandomCombinations:
+    """Test random video+audio format combinations for single videos"""
 
-    def test_random_combination_5(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
-        """Test random video+audio combination #5"""
-        self._test_random_combination(temp_download_dir, update_queue, available_formats, seed=5)
+    @pytest.mark.parametrize("seed", SINGLE_VIDEO_SEEDS)
+    def test_random_combination(self, tmp_path, update_queue, available_formats, seed):
+        """Test a seeded random video+audio combination"""
+        self._test_random_combination(tmp_path, update_queue, available_formats, seed=seed)
 
-    def _test_random_combination(self, temp_download_dir, update_queue, available_formats, seed):
+    def _test_random_combination(self, tmp_path, update_queue, available_formats, seed):
         """Helper method to test a random video+audio combination"""
-        random.seed(seed)  # Reproducible randomness
-        
-        video_formats = available_formats["video"]
-        audio_formats = available_formats["audio"]
         video_url = available_formats["video_url"]
         
-        # Select random video and audio format
-        video_fmt = random.choice(video_formats)
-        audio_fmt = random.choice(audio_formats)
+        # Seeded random video and audio format, picked once by the fixture
+        video_fmt, audio_fmt = available_formats["seeded_picks"][seed]
         
         video_id = video_fmt["id"]
         audio_id = audio_fmt["id"]
@@ -160,42 +224,20 @@ class TestSingleVideoRandomCombinations:
         thread = DownloadThread(
             url=video_url,
             format_id=None,  # Not used for manual selection
-            output_path=temp_download_dir,
+            output_path=str(tmp_path),
             update_queue=update_queue,
             video_format_id=video_id,
-            audio_format_id=audio_id
+            audio_format_id=audio_id,
+            preloaded_info=available_formats["info"]
         )
         
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=90.0)
-        
-        # Collect messages
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
-        
-        # Check for success
-        finished = [m for m in messages if m.get("type") == "finished"]
-        errors = [m for m in messages if m.get("type") == "error"]
-        
-        if errors:
-            print(f"[ERROR] Download errors: {[e.get('text') for e in errors]}")
-        
-        assert len(finished) > 0, f"Should complete download with {video_id}+{audio_id}. Errors: {errors}"
-        
-        # Verify file exists
-        video_files = list(Path(temp_download_dir).glob("*.*"))
-        assert len(video_files) > 0, "Should create merged file"
+        _, entry = _run_and_verify(thread, update_queue, tmp_path)
         
         # Verify filename contains the format IDs
-        filename = video_files[0].name
+        filename = entry.name
         assert video_id in filename or "+" in filename, f"Filename should indicate format: {filename}"
         
-        file_size = video_files[0].stat().st_size
+        file_size = entry.stat().st_size
         print(f"[OK] Downloaded: {filename}")
         print(f"     Size: {file_size / 1024:.1f} KB")
 
@@ -203,29 +245,17 @@ class TestSingleVideoRandomCombinations:
 class TestPlaylistRandomCombinations:
     """Test random video+audio format combinations for playlist videos"""
 
-    def test_playlist_random_combination_1(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
-        """Test random combination #1 in playlist context"""
-        self._test_playlist_random_combination(temp_download_dir, update_queue, available_formats, seed=10)
+    @pytest.mark.parametrize("seed", PLAYLIST_SEEDS)
+    def test_playlist_random_combination(self, tmp_path, update_queue, available_formats, seed):
+        """Test a seeded random combination in playlist context"""
+        self._test_playlist_random_combination(tmp_path, update_queue, available_formats, seed=seed)
 
-    def test_playlist_random_combination_2(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
-        """Test random combination #2 in playlist context"""
-        self._test_playlist_random_combination(temp_download_dir, update_queue, available_formats, seed=20)
-
-    def test_playlist_random_combination_3(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
-        """Test random combination #3 in playlist context"""
-        self._test_playlist_random_combination(temp_download_dir, update_queue, available_formats, seed=30)
-
-    def _test_playlist_random_combination(self, temp_download_dir, update_queue, available_formats, seed):
+    def _test_playlist_random_combination(self, tmp_path, update_queue, available_formats, seed):
         """Helper method to test random combination in playlist downloader"""
-        random.seed(seed)
-        
-        video_formats = available_formats["video"]
-        audio_formats = available_formats["audio"]
         video_url = available_formats["video_url"]
         
-        # Select random formats
-        video_fmt = random.choice(video_formats)
-        audio_fmt = random.choice(audio_formats)
+        # Seeded random formats, picked once by the fixture
+        video_fmt, audio_fmt = available_formats["seeded_picks"][seed]
         
         video_id = video_fmt["id"]
         audio_id = audio_fmt["id"]
@@ -238,42 +268,19 @@ class TestPlaylistRandomCombinations:
         downloader = PlaylistVideoDownloader(
             url=video_url,
             format_id=None,
-            output_path=temp_download_dir,
+            output_path=str(tmp_path),
             update_queue=update_queue,
             video_index=1,
             total_videos=1,
             video_format_id=video_id,
-            audio_format_id=audio_id
+            audio_format_id=audio_id,
+            preloaded_info=available_formats["info"]
         )
         
-        downloader.start()
-        if downloader.thread:
-            downloader.thread.join(timeout=90.0)
-        
-        # Collect messages
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
-        
-        # Check success
-        finished = [m for m in messages if m.get("type") in ["playlist_video_finished", "finished"]]
-        errors = [m for m in messages if m.get("type") in ["playlist_video_error", "error"]]
-        
-        if errors:
-            print(f"[ERROR] Errors: {[e.get('text') for e in errors]}")
+        _, entry = _run_and_verify(downloader, update_queue, tmp_path)
         
-        assert len(finished) > 0 or downloader.success, \
-            f"Should complete with {video_id}+{audio_id}. Success={downloader.success}, Errors: {errors}"
-        
-        # Verify file
-        video_files = list(Path(temp_download_dir).glob("*.*"))
-        assert len(video_files) > 0, "Should create file"
-        
-        filename = video_files[0].name
-        file_size = video_files[0].stat().st_size
+        filename = entry.name
+        file_size = entry.stat().st_size
         
         print(f"[OK] Playlist download: {filename}")
         print(f"     Size: {file_size / 1024:.1f} KB")
@@ -282,18 +289,13 @@ class TestPlaylistRandomCombinations:
 class TestFormatRespectVerification:
     """Verify that downloaded files actually use the requested formats"""
 
-    def test_verify_format_in_filename(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
+    def test_verify_format_in_filename(self, tmp_path, update_queue, available_formats):
         """Verify that the downloaded filename contains the requested format IDs"""
-        video_formats = available_formats["video"]
-        audio_formats = available_formats["audio"]
         video_url = available_formats["video_url"]
         
-        # Pick specific formats for verification
-        video_fmt = video_formats[0] if len(video_formats) > 0 else None
-        audio_fmt = audio_formats[0] if len(audio_formats) > 0 else None
-        
-        assert video_fmt is not None, "Need at least one video format"
-        assert audio_fmt is not None, "Need at least one audio format"
+        # Pick specific formats for verification (the fixture skips when empty)
+        video_fmt = available_formats["video"][0]
+        audio_fmt = available_formats["audio"][0]
         
         video_id = video_fmt["id"]
         audio_id = audio_fmt["id"]
@@ -305,32 +307,17 @@ class TestFormatRespectVerification:
         thread = DownloadThread(
             url=video_url,
             format_id=None,
-            output_path=temp_download_dir,
+            output_path=str(tmp_path),
             update_queue=update_queue,
             video_format_id=video_id,
-            audio_format_id=audio_id
+            audio_format_id=audio_id,
+            preloaded_info=available_formats["info"]
         )
         
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=90.0)
-        
-        # Get messages
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
-        
-        finished = [m for m in messages if m.get("type") == "finished"]
-        assert len(finished) > 0, "Should complete download"
-        
         # Check filename contains the format combination
-        video_files = list(Path(temp_download_dir).glob("*.*"))
-        assert len(video_files) > 0, "Should create file"
+        _, entry = _run_and_verify(thread, update_queue, tmp_path)
         
-        filename = video_files[0].name
+        filename = entry.name
         
         # Filename should contain the format combination in brackets
         # Format: "Title [video_id+audio_id].ext"
@@ -343,166 +330,65 @@ class TestFormatRespectVerification:
         print(f"     Contains expected format string: [{expected_format_string}]")
 
 
-class TestEdgeCaseFormats:
-    """Test edge cases and special format scenarios"""
+def _pick_highest(available_formats):
+    """Highest quality video (by height) with highest quality audio (by bitrate)"""
+    return available_formats["video_by_height"][-1], available_formats["audio_by_abr"][-1]
 
-    def test_highest_quality_video_with_highest_quality_audio(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
-        """Test combining the highest quality video with highest quality audio"""
-        video_formats = available_formats["video"]
-        audio_formats = available_formats["audio"]
-        video_url = available_formats["video_url"]
-        
-        # Find highest quality video (by height)
-        video_fmt = max(video_formats, key=lambda f: f.get("height", 0))
-        # Find highest quality audio (by bitrate)
-        audio_fmt = max(audio_formats, key=lambda f: f.get("abr", 0))
-        
-        video_id = video_fmt["id"]
-        audio_id = audio_fmt["id"]
-        
-        print(f"\n[HIGHEST QUALITY]")
-        print(f"  Video: {video_id} ({video_fmt['description']})")
-        print(f"  Audio: {audio_id} ({audio_fmt['description']})")
-        
-        thread = DownloadThread(
-            url=video_url,
-            format_id=None,
-            output_path=temp_download_dir,
-            update_queue=update_queue,
-            video_format_id=video_id,
-            audio_format_id=audio_id
-        )
-        
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=120.0)
-        
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
-        
-        finished = [m for m in messages if m.get("type") == "finished"]
-        errors = [m for m in messages if m.get("type") == "error"]
-        
-        if errors:
-            print(f"[ERROR] {errors}")
-        
-        assert len(finished) > 0, f"Should download highest quality. Errors: {errors}"
-        
-        video_files = list(Path(temp_download_dir).glob("*.*"))
-        file_size = video_files[0].stat().st_size if video_files else 0
-        
-        print(f"[OK] Highest quality downloaded: {video_files[0].name if video_files else 'unknown'}")
-        print(f"     Size: {file_size / (1024 * 1024):.2f} MB")
 
-    def test_lowest_quality_video_with_lowest_quality_audio(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
-        """Test combining the lowest quality video with lowest quality audio"""
-        video_formats = available_formats["video"]
-        audio_formats = available_formats["audio"]
-        video_url = available_formats["video_url"]
-        
-        # Find lowest quality video (by height)
-        video_fmt = min([f for f in video_formats if f.get("height", 0) > 0], key=lambda f: f.get("height", 999))
-        # Find lowest quality audio (by bitrate)
-        audio_fmt = min([f for f in audio_formats if f.get("abr", 0) > 0], key=lambda f: f.get("abr", 999))
-        
-        video_id = video_fmt["id"]
-        audio_id = audio_fmt["id"]
-        
-        print(f"\n[LOWEST QUALITY]")
-        print(f"  Video: {video_id} ({video_fmt['description']})")
-        print(f"  Audio: {audio_id} ({audio_fmt['description']})")
-        
-        thread = DownloadThread(
-            url=video_url,
-            format_id=None,
-            output_path=temp_download_dir,
-            update_queue=update_queue,
-            video_format_id=video_id,
-            audio_format_id=audio_id
-        )
-        
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=60.0)
-        
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
-        
-        finished = [m for m in messages if m.get("type") == "finished"]
-        assert len(finished) > 0, "Should download lowest quality"
-        
-        video_files = list(Path(temp_download_dir).glob("*.*"))
-        file_size = video_files[0].stat().st_size if video_files else 0
-        
-        print(f"[OK] Lowest quality downloaded: {video_files[0].name if video_files else 'unknown'}")
-        print(f"     Size: {file_size / 1024:.1f} KB")
+def _pick_lowest(available_formats):
+    """Lowest non-zero quality video (by height) with lowest audio (by bitrate)"""
+    return available_formats["video_nonzero"][0], available_formats["audio_nonzero"][0]
+
+
+def _pick_mixed_containers(available_formats):
+    """mp4 video with webm/opus audio, falling back to the first of each"""
+    video_formats = available_formats["video"]
+    audio_formats = available_formats["audio"]
+    video_fmt = next((vf for vf in video_formats if vf["ext"] in _PREFERRED_VIDEO_EXTS), video_formats[0])
+    audio_fmt = next((af for af in audio_formats if af["ext"] in _PREFERRED_AUDIO_EXTS), audio_formats[0])
+    return video_fmt, audio_fmt
+
 
-    def test_mismatched_formats_different_containers(self, temp_download_dir, update_queue, loaded_cookies, available_formats):
-        """Test combining formats with different containers (e.g., mp4 video + webm audio)"""
-        video_formats = available_formats["video"]
-        audio_formats = available_formats["audio"]
+# profile -> (format picker, join timeout in seconds)
+EDGE_CASE_PROFILES = {
+    "highest": (_pick_highest, 120.0),
+    "lowest": (_pick_lowest, 60.0),
+    "mixed_containers": (_pick_mixed_containers, 90.0),
+}
+
+
+class TestEdgeCaseFormats:
+    """Test edge cases and special format scenarios"""
+
+    @pytest.mark.parametrize("profile", list(EDGE_CASE_PROFILES))
+    def test_edge_case_profile(self, tmp_path, update_queue, available_formats, profile):
+        """Test highest, lowest and mixed-container video+audio combinations"""
+        pick_formats, timeout = EDGE_CASE_PROFILES[profile]
+        video_fmt, audio_fmt = pick_formats(available_formats)
         video_url = available_formats["video_url"]
         
-        # Try to find mp4 video and webm audio (or vice versa)
-        video_fmt = None
-        audio_fmt = None
-        
-        for vf in video_formats:
-            if vf["ext"] == "mp4":
-                video_fmt = vf
-                break
-        
-        for af in audio_formats:
-            if af["ext"] in ["webm", "opus"]:
-                audio_fmt = af
-                break
-        
-        # Fallback to any formats if specific containers not found
-        if video_fmt is None:
-            video_fmt = video_formats[0]
-        if audio_fmt is None:
-            audio_fmt = audio_formats[0]
-        
         video_id = video_fmt["id"]
         audio_id = audio_fmt["id"]
         
-        print(f"\n[MIXED CONTAINERS]")
+        print(f"\n[{profile.upper()}]")
         print(f"  Video: {video_id} ({video_fmt['ext']}) - {video_fmt['description']}")
         print(f"  Audio: {audio_id} ({audio_fmt['ext']}) - {audio_fmt['description']}")
         
         thread = DownloadThread(
             url=video_url,
             format_id=None,
-            output_path=temp_download_dir,
+            output_path=str(tmp_path),
             update_queue=update_queue,
             video_format_id=video_id,
-            audio_format_id=audio_id
+            audio_format_id=audio_id,
+            preloaded_info=available_formats["info"]
         )
         
-        thread.start()
-        if thread.thread:
-            thread.thread.join(timeout=90.0)
+        _, entry = _run_and_verify(thread, update_queue, tmp_path, timeout=timeout)
+        file_size = entry.stat().st_size
         
-        messages = []
-        while not update_queue.empty():
-            try:
-                messages.append(update_queue.get_nowait())
-            except queue.Empty:
-                break
-        
-        finished = [m for m in messages if m.get("type") == "finished"]
-        assert len(finished) > 0, "Should handle mismatched containers (FFmpeg remuxes)"
-        
-        video_files = list(Path(temp_download_dir).glob("*.*"))
-        print(f"[OK] Mixed containers handled: {video_files[0].name if video_files else 'unknown'}")
+        print(f"[OK] {profile} downloaded: {entry.name}")
+        print(f"     Size: {file_size / 1024:.1f} KB")
 
 
 if __name__ == "__main__":
@@ -6,17 +6,37 @@ Tests cookie extraction, browser detection, and authentication logic
 without any GUI creation or user interaction.
 """
 
-from unittest.mock import Mock, mock_open, patch
+import io
+from unittest.mock import Mock, patch
 
 import pytest
 
 from cookie_manager import CookieManager, get_cookie_manager
 
 
+# Unpatched method for the detection tests, which feed it their own processes
+_REAL_IS_CHROME_RUNNING = CookieManager._is_chrome_running
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _no_process_scan():
+    """Stop Chrome-running checks from enumerating real processes.
+
+    Patches the method rather than psutil.process_iter, so the module does
+    not import psutil (or fall back to tasklist) when it is unavailable.
+    """
+    with patch.object(CookieManager, "_is_chrome_running", return_value=False):
+        yield
+
+
 @pytest.fixture
 def cookie_manager():
-    """Provide a CookieManager instance with mocked logger"""
-    with patch("cookie_manager.AppLogger"):
+    """Provide a CookieManager instance (AppLogger is patched by patch_loggers)
+
+    Chrome detection is stubbed during construction so no registry or
+    profile paths are probed; tests set chrome_info themselves.
+    """
+    with patch.object(CookieManager, "_detect_chrome", return_value=None):
         return CookieManager()
 
 
@@ -127,15 +147,29 @@ def test_cookie_file_import_success(cookie_manager):
 .youtube.com	TRUE	/	FALSE	1234567890	auth_token	test_value2
 """
 
-    with (
-        patch("cookie_manager.os.path.exists", return_value=True),
-        patch("builtins.open", mock_open(read_data=cookie_content)),
-    ):
-        # Execute cookie import
-        result = cookie_manager.import_cookie_file("/path/to/cookies.txt")
+    # Execute cookie import on an in-memory stream
+    result = cookie_manager._import_cookie_stream(
+        io.StringIO(cookie_content), "/path/to/cookies.txt"
+    )
 
-        # Verify success
-        assert result is True
+    # Verify success
+    assert result is True
+
+
+def test_cookie_file_import_from_disk(cookie_manager, tmp_path):
+    """Test importing a Netscape cookie file through the public file API"""
+    cookie_content = """# Netscape HTTP Cookie File
+.youtube.com	TRUE	/	FALSE	1234567890	session_token	test_value
+.youtube.com	TRUE	/	FALSE	1234567890	auth_token	test_value2
+"""
+    cookie_file = tmp_path / "cookies.txt"
+    cookie_file.write_text(cookie_content, encoding="utf-8")
+
+    result = cookie_manager.import_cookie_file(str(cookie_file))
+
+    assert result is True
+    assert cookie_manager.cookie_cache["youtube.com_manual"] == cookie_content
+    assert cookie_manager._manual_cookie_file_path == str(cookie_file)
 
 
 def test_cookie_file_import_file_not_found(cookie_manager):
@@ -153,16 +187,14 @@ def test_cookie_file_import_invalid_format(cookie_manager):
     # Mock invalid cookie content
     invalid_content = "This is not a valid cookie file"
 
-    with (
-        patch("cookie_manager.os.path.exists", return_value=True),
-        patch("builtins.open", mock_open(read_data=invalid_content)),
-    ):
-        # Execute cookie import
-        result = cookie_manager.import_cookie_file("/path/to/invalid.txt")
+    # Execute cookie import on an in-memory stream
+    result = cookie_manager._import_cookie_stream(
+        io.StringIO(invalid_content), "/path/to/invalid.txt"
+    )
 
-        # Verify failure (or success with empty cookies, depending on implementation)
-        # The exact behavior depends on how the parser handles invalid content
-        assert isinstance(result, bool)
+    # Verify failure (or success with empty cookies, depending on implementation)
+    # The exact behavior depends on how the parser handles invalid content
+    assert isinstance(result, bool)
 
 
 def test_ytdlp_cookie_integration(cookie_manager):
@@ -198,7 +230,7 @@ def test_chrome_running_detection(cookie_manager):
 
         mock_process_iter.return_value = [mock_process1, mock_process2]
 
-        is_running = cookie_manager._is_chrome_running()
+        is_running = _REAL_IS_CHROME_RUNNING(cookie_manager)
 
         assert is_running is True
 
@@ -211,7 +243,7 @@ def test_chrome_not_running_detection(cookie_manager):
 
         mock_process_iter.return_value = [mock_process]
 
-        is_running = cookie_manager._is_chrome_running()
+        is_running = _REAL_IS_CHROME_RUNNING(cookie_manager)
 
         assert is_running is False
 
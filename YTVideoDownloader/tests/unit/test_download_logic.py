@@ -6,10 +6,7 @@ Tests download thread management, progress tracking, and format selection
 without any GUI creation or user interaction.
 """
 
-import os
-import queue
-import shutil
-import tempfile
+import collections
 from unittest.mock import Mock, patch
 
 import pytest
@@ -23,48 +20,55 @@ def test_url():
     return "https://www.youtube.com/watch?v=test123"
 
 
-@pytest.fixture
-def test_output_path():
-    """Provide a temporary output directory"""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
+class FastQueue(collections.deque):
+    """Lock-free stand-in for queue.Queue in single-threaded tests
+
+    These tests call thread.run() directly, so producer and consumer never
+    overlap and the Queue's mutex and condition variables are pure overhead.
+    """
+
+    def put(self, item, block=True, timeout=None):
+        # Same signature as queue.Queue.put; the progress hook passes timeout
+        self.append(item)
+
+    def get(self):
+        return self.popleft()
+
+    def empty(self):
+        return not self
 
 
 @pytest.fixture
 def update_queue():
     """Provide a fresh update queue"""
-    return queue.Queue()
+    return FastQueue()
 
 
 def test_download_thread_initialization_automatic_format(
-    test_url, test_output_path, update_queue
+    test_url, tmp_path, update_queue
 ):
     """Test DownloadThread initialization with automatic format selection"""
     thread = DownloadThread(
         url=test_url,
         format_id="best",
-        output_path=test_output_path,
+        output_path=str(tmp_path),
         update_queue=update_queue,
     )
 
     assert thread.url == test_url
     assert thread.format_id == "best"
-    assert thread.output_path == test_output_path
+    assert thread.output_path == str(tmp_path)
     assert thread.video_format_id is None
     assert thread.audio_format_id is None
     assert thread.cancelled is False
 
 
-def test_download_thread_initialization_manual_format(
-    test_url, test_output_path, update_queue
-):
+def test_download_thread_initialization_manual_format(test_url, tmp_path, update_queue):
     """Test DownloadThread initialization with manual format selection"""
     thread = DownloadThread(
         url=test_url,
         format_id=None,
-        output_path=test_output_path,
+        output_path=str(tmp_path),
         update_queue=update_queue,
         video_format_id="137",
         audio_format_id="140",
@@ -78,162 +82,261 @@ def test_download_thread_initialization_manual_format(
 
 
 def test_format_string_construction_manual_selection(
-    test_url, test_output_path, update_queue
+    test_url, tmp_path, update_queue, fake_ytdl
 ):
     """Test format string construction for manual selection"""
     thread = DownloadThread(
         url=test_url,
         format_id=None,
-        output_path=test_output_path,
+        output_path=str(tmp_path),
         update_queue=update_queue,
         video_format_id="137",
         audio_format_id="140",
     )
 
+    thread.run()
+
+    formats = [opts["format"] for opts in fake_ytdl.opts if "format" in opts]
+    assert "137+140" in formats, "Expected format '137+140' not found in yt-dlp calls"
+
+
+def test_format_string_construction_automatic_selection(
+    test_url, tmp_path, update_queue, fake_ytdl
+):
+    """Test format string construction for automatic selection"""
+    thread = DownloadThread(
+        url=test_url,
+        format_id="best",
+        output_path=str(tmp_path),
+        update_queue=update_queue,
+    )
+
+    thread.run()
+
+    formats = [opts["format"] for opts in fake_ytdl.opts if "format" in opts]
+    assert any(
+        format_str.startswith("best") for format_str in formats
+    ), "Expected format starting with 'best' not found in yt-dlp calls"
+
+
+def test_ratelimit_forwarded_to_ydl_opts(test_url, tmp_path, update_queue):
+    """Test that a ratelimit is passed to yt-dlp for the download attempt"""
+    thread = DownloadThread(
+        url=test_url,
+        format_id="worst",
+        output_path=str(tmp_path),
+        update_queue=update_queue,
+        ratelimit=50_000,
+    )
+
     with (
         patch("download_threads.yt_dlp.YoutubeDL") as mock_ytdl,
         patch("download_threads.check_ffmpeg", return_value=True),
     ):
-        mock_ytdl_instance = Mock()
-        mock_ytdl.return_value.__enter__.return_value = mock_ytdl_instance
+        mock_ytdl.return_value.__enter__.return_value = Mock()
         mock_ytdl.return_value.__exit__.return_value = None
 
         thread.run()
 
-        mock_ytdl.assert_called()
-        call_args_list = mock_ytdl.call_args_list
-        found_correct_format = False
+        download_opts = [
+            call_args[0][0]
+            for call_args in mock_ytdl.call_args_list
+            # The filename prediction also passes the format, but only simulates
+            if call_args[0]
+            and "format" in call_args[0][0]
+            and not call_args[0][0].get("simulate")
+        ]
+        assert download_opts, "Expected a yt-dlp download call"
+        assert all(opts.get("ratelimit") == 50_000 for opts in download_opts)
+
+
+def test_preloaded_info_reused_instead_of_extraction(test_url, tmp_path, update_queue):
+    """Test that a preloaded info dict is processed instead of re-extracted"""
+    info = {"id": "test123", "title": "Test", "formats": []}
+    thread = DownloadThread(
+        url=test_url,
+        format_id="best",
+        output_path=str(tmp_path),
+        update_queue=update_queue,
+        preloaded_info=info,
+    )
 
-        for call_args in call_args_list:
-            if call_args and len(call_args) > 0:
-                ydl_opts = call_args[0][0] if call_args[0] else {}
-                if isinstance(ydl_opts, dict) and "format" in ydl_opts:
-                    if ydl_opts["format"] == "137+140":
-                        found_correct_format = True
-                        break
+    with (
+        patch("download_threads.yt_dlp.YoutubeDL") as mock_ytdl,
+        patch("download_threads.check_ffmpeg", return_value=True),
+    ):
+        mock_ydl = Mock()
+        mock_ytdl.return_value.__enter__.return_value = mock_ydl
+        mock_ytdl.return_value.__exit__.return_value = None
 
-        assert (
-            found_correct_format
-        ), "Expected format '137+140' not found in yt-dlp calls"
+        thread.run()
 
+        mock_ydl.extract_info.assert_not_called()
+        mock_ydl.download.assert_not_called()
+        processed_info = mock_ydl.process_ie_result.call_args[0][0]
+        assert processed_info == info
+        # yt-dlp gets a copy, so the shared info dict is never mutated
+        assert processed_info is not info
 
-def test_format_string_construction_automatic_selection(
-    test_url, test_output_path, update_queue
+
+def test_preloaded_info_filename_uses_requested_format(
+    test_url, tmp_path, update_queue
 ):
-    """Test format string construction for automatic selection"""
+    """Test that the predicted filename reflects the requested format"""
+    # Runs real yt-dlp format selection offline on a synthetic info dict
+    info = {
+        "id": "test123",
+        "title": "Test",
+        "extractor": "youtube",
+        "extractor_key": "Youtube",
+        "webpage_url": test_url,
+        "formats": [
+            {
+                "format_id": fmt_id,
+                "url": f"https://example.invalid/{fmt_id}.mp4",
+                "ext": "mp4",
+                "vcodec": "avc1",
+                "acodec": "mp4a",
+                "height": height,
+            }
+            for fmt_id, height in (("18", 360), ("22", 720))
+        ],
+    }
+    thread = DownloadThread(
+        url=test_url,
+        format_id="18",
+        output_path=str(tmp_path),
+        update_queue=update_queue,
+        preloaded_info=info,
+    )
+    base_template = str(tmp_path / "%(title)s [%(format_id)s].%(ext)s")
+
+    template, expected_filename = thread._generate_unique_filename(base_template, "18")
+
+    assert template == base_template
+    assert expected_filename == str(tmp_path / "Test [18].mp4")
+    # Selection ran on a copy, so the shared info dict is untouched
+    assert "format_id" not in info
+
+
+def test_existing_file_for_format_gets_suffix(test_url, tmp_path, update_queue):
+    """Test that an existing file for the requested format yields a _1 name"""
+    existing = tmp_path / "Test [18].mp4"
+    existing.write_text("already downloaded")
+    thread = DownloadThread(
+        url=test_url,
+        format_id="18",
+        output_path=str(tmp_path),
+        update_queue=update_queue,
+    )
+    base_template = str(tmp_path / "%(title)s [%(format_id)s].%(ext)s")
+
+    with patch("download_threads.yt_dlp.YoutubeDL") as mock_ytdl:
+        mock_ydl = Mock()
+        mock_ydl.extract_info.return_value = {"title": "Test", "format_id": "18"}
+        mock_ydl.prepare_filename.return_value = str(existing)
+        mock_ytdl.return_value.__enter__.return_value = mock_ydl
+        mock_ytdl.return_value.__exit__.return_value = None
+
+        template, expected_filename = thread._generate_unique_filename(
+            base_template, "18"
+        )
+
+        # The prediction must resolve the same format the download will use
+        assert mock_ytdl.call_args[0][0]["format"] == "18"
+
+    assert template == str(tmp_path / "%(title)s_1 [%(format_id)s].%(ext)s")
+    assert expected_filename == str(tmp_path / "Test [18]_1.mp4")
+
+
+def test_wait_done_set_when_run_returns(test_url, tmp_path, update_queue):
+    """Test that wait_done reports completion once run() has returned"""
     thread = DownloadThread(
         url=test_url,
         format_id="best",
-        output_path=test_output_path,
+        output_path=str(tmp_path),
         update_queue=update_queue,
     )
+    assert thread.wait_done(0) is False
 
     with (
         patch("download_threads.yt_dlp.YoutubeDL") as mock_ytdl,
         patch("download_threads.check_ffmpeg", return_value=True),
     ):
-        mock_ytdl_instance = Mock()
-        mock_ytdl.return_value.__enter__.return_value = mock_ytdl_instance
+        mock_ytdl.return_value.__enter__.return_value = Mock()
         mock_ytdl.return_value.__exit__.return_value = None
 
         thread.run()
 
-        mock_ytdl.assert_called()
-        call_args_list = mock_ytdl.call_args_list
-        found_best_format = False
-
-        for call_args in call_args_list:
-            if call_args and len(call_args) > 0:
-                ydl_opts = call_args[0][0] if call_args[0] else {}
-                if isinstance(ydl_opts, dict) and "format" in ydl_opts:
-                    format_str = ydl_opts["format"]
-                    if format_str.startswith("best"):
-                        found_best_format = True
-                        break
-
-        assert (
-            found_best_format
-        ), "Expected format starting with 'best' not found in yt-dlp calls"
+    assert thread.wait_done(0) is True
 
 
-def test_download_success_flow(test_url, test_output_path, update_queue):
+def test_download_success_flow(test_url, tmp_path, update_queue, fake_ytdl):
     """Test successful download flow"""
-    with (
-        patch("download_threads.check_ffmpeg", return_value=True),
-        patch("download_threads.yt_dlp.YoutubeDL") as mock_ytdl,
-    ):
-        mock_ytdl_instance = Mock()
 
-        def create_test_file(url_list):
-            test_file = os.path.join(test_output_path, "test_video.mp4")
-            with open(test_file, "w") as f:
-                f.write("test video content")
+    def create_test_file(url_list):
+        (tmp_path / "test_video.mp4").write_text("test video content")
 
-        mock_ytdl_instance.download.side_effect = create_test_file
-        mock_ytdl.return_value.__enter__.return_value = mock_ytdl_instance
-        mock_ytdl.return_value.__exit__.return_value = None
+    fake_ytdl.on_download = create_test_file
 
-        thread = DownloadThread(
-            url=test_url,
-            format_id="best",
-            output_path=test_output_path,
-            update_queue=update_queue,
-        )
+    thread = DownloadThread(
+        url=test_url,
+        format_id="best",
+        output_path=str(tmp_path),
+        update_queue=update_queue,
+    )
 
-        thread.run()
+    thread.run()
 
-        mock_ytdl_instance.download.assert_called_once_with([test_url])
+    assert fake_ytdl.downloads == [[test_url]]
 
-        messages = []
-        while not update_queue.empty():
-            messages.append(update_queue.get())
+    messages = []
+    while not update_queue.empty():
+        messages.append(update_queue.get())
 
-        status_messages = [msg for msg in messages if msg.get("type") == "status"]
-        finished_messages = [msg for msg in messages if msg.get("type") == "finished"]
+    status_messages = [msg for msg in messages if msg.get("type") == "status"]
+    finished_messages = [msg for msg in messages if msg.get("type") == "finished"]
 
-        assert len(status_messages) > 0
-        assert len(finished_messages) == 1
-        assert (
-            "Download completed:" in finished_messages[0]["text"]
-            or "completed successfully" in finished_messages[0]["text"]
-        )
+    assert len(status_messages) > 0
+    assert len(finished_messages) == 1
+    assert (
+        "Download completed:" in finished_messages[0]["text"]
+        or "completed successfully" in finished_messages[0]["text"]
+    )
 
 
-def test_download_error_flow(test_url, test_output_path, update_queue):
+def test_download_error_flow(test_url, tmp_path, update_queue, fake_ytdl):
     """Test download error handling flow"""
-    with (
-        patch("download_threads.check_ffmpeg", return_value=True),
-        patch("download_threads.yt_dlp.YoutubeDL") as mock_ytdl,
-    ):
-        mock_ytdl_instance = Mock()
-        mock_ytdl_instance.download.side_effect = Exception("Download failed")
-        mock_ytdl.return_value.__enter__.return_value = mock_ytdl_instance
-        mock_ytdl.return_value.__exit__.return_value = None
 
-        thread = DownloadThread(
-            url=test_url,
-            format_id="best",
-            output_path=test_output_path,
-            update_queue=update_queue,
-        )
+    def fail_download(url_list):
+        raise Exception("Download failed")
 
-        thread.run()
+    fake_ytdl.on_download = fail_download
+
+    thread = DownloadThread(
+        url=test_url,
+        format_id="best",
+        output_path=str(tmp_path),
+        update_queue=update_queue,
+    )
+
+    thread.run()
 
-        messages = []
-        while not update_queue.empty():
-            messages.append(update_queue.get())
+    messages = []
+    while not update_queue.empty():
+        messages.append(update_queue.get())
 
-        error_messages = [msg for msg in messages if msg.get("type") == "error"]
-        assert len(error_messages) == 1
-        assert "Download failed" in error_messages[0]["text"]
+    error_messages = [msg for msg in messages if msg.get("type") == "error"]
+    assert len(error_messages) == 1
+    assert "Download failed" in error_messages[0]["text"]
 
 
-def test_progress_hook_with_total_bytes(test_url, test_output_path, update_queue):
+def test_progress_hook_with_total_bytes(test_url, tmp_path, update_queue):
     """Test progress hook with total bytes information"""
     thread = DownloadThread(
         url=test_url,
         format_id="best",
-        output_path=test_output_path,
+        output_path=str(tmp_path),
         update_queue=update_queue,
     )
 
@@ -260,12 +363,12 @@ def test_progress_hook_with_total_bytes(test_url, test_output_path, update_queue
     assert "50%" in status_messages[0]["text"]
 
 
-def test_progress_hook_with_percent_string(test_url, test_output_path, update_queue):
+def test_progress_hook_with_percent_string(test_url, tmp_path, update_queue):
     """Test progress hook with percent string information"""
     thread = DownloadThread(
         url=test_url,
         format_id="best",
-        output_path=test_output_path,
+        output_path=str(tmp_path),
         update_queue=update_queue,
     )
 
@@ -282,12 +385,12 @@ def test_progress_hook_with_percent_string(test_url, test_output_path, update_qu
     assert progress_messages[0]["value"] == 75
 
 
-def test_quality_aware_fallbacks(test_url, test_output_path, update_queue):
+def test_quality_aware_fallbacks(test_url, tmp_path, update_queue):
     """Test quality-aware fallback sequence generation"""
     thread = DownloadThread(
         url=test_url,
         format_id="best",
-        output_path=test_output_path,
+        output_path=str(tmp_path),
         update_queue=update_queue,
     )
 
@@ -304,13 +407,13 @@ def test_quality_aware_fallbacks(test_url, test_output_path, update_queue):
     assert "best[height<=480]" in fallbacks_best
 
 
-def test_ffmpeg_unavailable_fallback(test_url, test_output_path, update_queue):
+def test_ffmpeg_unavailable_fallback(test_url, tmp_path, update_queue):
     """Test fallback when FFmpeg is unavailable for merging"""
     with patch("download_threads.check_ffmpeg", return_value=False):
         thread = DownloadThread(
             url=test_url,
             format_id=None,
-            output_path=test_output_path,
+            output_path=str(tmp_path),
             update_queue=update_queue,
             video_format_id="137",
             audio_format_id="140",
@@ -356,7 +459,7 @@ def test_cookie_integration_in_download():
             url="https://www.youtube.com/watch?v=test123",
             format_id="best",
             output_path="/test/output",
-            update_queue=queue.Queue(),
+            update_queue=FastQueue(),
         )
 
         thread.run()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Pytest-style tests for FFmpeg detection caching
+
+check_ffmpeg() and get_bundled_ffmpeg_path() remember a successful lookup
+but re-probe after a miss. The probes themselves are patched out, so these
+tests never touch the filesystem or run ffmpeg.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+import utils
+
+
+@pytest.fixture(autouse=True)
+def reset_ffmpeg_cache(monkeypatch):
+    """Start every test with an empty FFmpeg cache and restore it afterwards"""
+    monkeypatch.setattr(utils, "_ffmpeg_found", False)
+    monkeypatch.setattr(utils, "_bundled_ffmpeg_path", None)
+
+
+def test_check_ffmpeg_reprobes_after_miss():
+    """Test that a negative result is not cached"""
+    with patch("utils._probe_ffmpeg", side_effect=[False, True]) as mock_probe:
+        assert utils.check_ffmpeg() is False
+        # e.g. FFmpeg installed after the startup check
+        assert utils.check_ffmpeg() is True
+
+    assert mock_probe.call_count == 2
+
+
+def test_check_ffmpeg_caches_hit():
+    """Test that a positive result is served without probing again"""
+    with patch("utils._probe_ffmpeg", return_value=True) as mock_probe:
+        assert utils.check_ffmpeg() is True
+        assert utils.check_ffmpeg() is True
+
+    mock_probe.assert_called_once_with()
+
+
+def test_bundled_ffmpeg_path_reprobes_after_miss():
+    """Test that a missing bundled binary is looked up again"""
+    with patch(
+        "utils._find_bundled_ffmpeg_path", side_effect=[None, "/app/bin/ffmpeg"]
+    ) as mock_find:
+        assert utils.get_bundled_ffmpeg_path() is None
+        assert utils.get_bundled_ffmpeg_path() == "/app/bin/ffmpeg"
+
+    assert mock_find.call_count == 2
+
+
+def test_bundled_ffmpeg_path_caches_hit():
+    """Test that a found bundled binary path is remembered"""
+    with patch(
+        "utils._find_bundled_ffmpeg_path", return_value="/app/bin/ffmpeg"
+    ) as mock_find:
+        assert utils.get_bundled_ffmpeg_path() == "/app/bin/ffmpeg"
+        assert utils.get_bundled_ffmpeg_path() == "/app/bin/ffmpeg"
+
+    mock_find.assert_called_once_with()
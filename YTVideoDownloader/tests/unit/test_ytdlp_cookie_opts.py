@@ -102,3 +102,26 @@ def test_downloadthread_uses_cookiefile_from_manual_import(
         assert data.get("source") == "manual_import"
         cookie_file = data.get("cookie_file")
         assert cookie_file and os.path.exists(cookie_file)
+
+
+def test_cookie_file_diagnostics_rescans_changed_file(tmp_path):
+    """Test that cookie key diagnostics are cached but follow file changes"""
+    from utils import cookie_file_diagnostics
+
+    cookie_file = tmp_path / "cookies.txt"
+    cookie_file.write_text(NETSCAPE_SAMPLE, encoding="utf-8")
+
+    exists, size, keys = cookie_file_diagnostics(str(cookie_file))
+    assert exists is True
+    assert size == cookie_file.stat().st_size
+    assert keys == ["SID", "VISITOR_INFO1_LIVE"]
+
+    # Rewriting the file changes its size, so it must be scanned again
+    cookie_file.write_text(
+        NETSCAPE_SAMPLE + ".youtube.com\tTRUE\t/\tTRUE\t1791957520\tSAPISID\tabc\n",
+        encoding="utf-8",
+    )
+    _, _, keys = cookie_file_diagnostics(str(cookie_file))
+    assert "SAPISID" in keys
+
+    assert cookie_file_diagnostics(str(tmp_path / "missing.txt")) == (False, 0, [])
@@ -6,6 +6,7 @@ This module contains shared utility functions used across the application
 to avoid circular import dependencies.
 """
 
+import functools
 import os
 import platform
 import re
@@ -192,9 +193,28 @@ def _get_unix_downloads_folder():
         return os.path.join(os.path.expanduser("~"), "Downloads")
 
 
-@log_function_calls(timeout=15.0)
+# Positive FFmpeg lookups only; a miss is re-probed on the next call so an
+# FFmpeg installed while the app is running is still picked up. lru_cache
+# (as used for the URL helpers) would also memoize the startup miss.
+_bundled_ffmpeg_path = None
+_ffmpeg_found = False
+
+
 def get_bundled_ffmpeg_path():
-    """Get path to bundled FFmpeg binary"""
+    """Get path to bundled FFmpeg binary
+
+    A found path is remembered for the life of the process; when none is
+    found the lookup runs again on the next call.
+    """
+    global _bundled_ffmpeg_path
+    if _bundled_ffmpeg_path is None:
+        _bundled_ffmpeg_path = _find_bundled_ffmpeg_path()
+    return _bundled_ffmpeg_path
+
+
+@log_function_calls(timeout=15.0)
+def _find_bundled_ffmpeg_path():
+    """Look up the bundled or imageio FFmpeg binary, or return None"""
     logger = AppLogger.get_instance()
 
     # First check for manually bundled FFmpeg in bin directory
@@ -252,9 +272,21 @@ def get_bundled_ffmpeg_path():
     return None
 
 
-@log_function_calls(timeout=30.0)
 def check_ffmpeg():
-    """Check for FFmpeg in multiple locations"""
+    """Check for FFmpeg in multiple locations
+
+    Once FFmpeg has been found the answer is cached; a negative result is
+    re-checked on every call, so installing FFmpeg needs no restart.
+    """
+    global _ffmpeg_found
+    if not _ffmpeg_found:
+        _ffmpeg_found = _probe_ffmpeg()
+    return _ffmpeg_found
+
+
+@log_function_calls(timeout=30.0)
+def _probe_ffmpeg():
+    """Probe the bundled path and then the system PATH for FFmpeg"""
     logger = AppLogger.get_instance()
 
     from app_logger import log_operation
@@ -301,27 +333,40 @@ def check_ffmpeg():
             return False
 
 
+# URL classification patterns, compiled once at import
+_PLAYLIST_URL_RE = re.compile(
+    "|".join(
+        [
+            r"youtube\.com/playlist\?list=",
+            r"youtube\.com/watch\?v=.+&list=",
+            r"youtube\.com/watch\?list=.+&v=",
+            r"youtube\.com/.+/playlists",
+            r"youtube\.com/channel/.+/playlists",
+            r"youtube\.com/user/.+/playlists",
+        ]
+    )
+)
+_LIST_PARAM_RE = re.compile(r"list=([^&]*)")
+# Pattern to match YouTube video IDs, tried in order of precedence
+_VIDEO_ID_PATTERNS = (
+    re.compile(r"(?:youtube\.com/watch\?v=)([a-zA-Z0-9_-]{11})"),
+    re.compile(r"(?:youtu\.be/)([a-zA-Z0-9_-]{11})"),
+    re.compile(r"(?:youtube\.com/embed/)([a-zA-Z0-9_-]{11})"),
+    re.compile(r"(?:youtube\.com/v/)([a-zA-Z0-9_-]{11})"),
+)
+
+
+@functools.lru_cache(maxsize=128)
 def is_playlist_url(url):
     """Check if the URL is a playlist URL"""
-    playlist_patterns = [
-        r"youtube\.com/playlist\?list=",
-        r"youtube\.com/watch\?v=.+&list=",
-        r"youtube\.com/watch\?list=.+&v=",
-        r"youtube\.com/.+/playlists",
-        r"youtube\.com/channel/.+/playlists",
-        r"youtube\.com/user/.+/playlists",
-    ]
-
-    for pattern in playlist_patterns:
-        if re.search(pattern, url):
-            return True
-    return False
+    return _PLAYLIST_URL_RE.search(url) is not None
 
 
+@functools.lru_cache(maxsize=128)
 def normalize_playlist_url(url):
     """Normalize YouTube playlist URLs by removing all parameters except list"""
     # Extract the list parameter from any YouTube URL format
-    match = re.search(r"list=([^&]*)", url)
+    match = _LIST_PARAM_RE.search(url)
     if match:
         return f"https://www.youtube.com/playlist?list={match.group(1)}"
 
@@ -336,16 +381,8 @@ def clean_url_for_video_info(url):
     both video and playlist parameters, preventing HTTP 400 errors when
     using authenticated requests with yt-dlp.
     """
-    # Pattern to match YouTube video IDs
-    patterns = [
-        r"(?:youtube\.com/watch\?v=)([a-zA-Z0-9_-]{11})",
-        r"(?:youtu\.be/)([a-zA-Z0-9_-]{11})",
-        r"(?:youtube\.com/embed/)([a-zA-Z0-9_-]{11})",
-        r"(?:youtube\.com/v/)([a-zA-Z0-9_-]{11})",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             video_id = match.group(1)
             return f"https://www.youtube.com/watch?v={video_id}"
@@ -378,6 +415,55 @@ class PlaylistVideo:
 
 
 # Shared yt-dlp helper functions
+# Auth cookie names reported by the cookie file diagnostics
+_DIAGNOSTIC_COOKIE_KEYS = (
+    "__Secure-3PAPISID",
+    "__Secure-3PSID",
+    "SAPISID",
+    "APISID",
+    "SID",
+    "HSID",
+    "SSID",
+    "VISITOR_INFO1_LIVE",
+    "CONSENT",
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _scan_cookie_file_keys(cookie_path: str, mtime_ns: int, size: int) -> tuple:
+    """Return the diagnostic cookie names present in a cookie file.
+
+    mtime_ns and size are part of the cache key only, so a rewritten file
+    is scanned again instead of being served from the cache.
+    """
+    with open(cookie_path, encoding="utf-8", errors="ignore") as cf:
+        text = cf.read()
+    return tuple(key for key in _DIAGNOSTIC_COOKIE_KEYS if key in text)
+
+
+def cookie_file_diagnostics(cookie_path: str) -> tuple:
+    """Describe a Netscape cookie file for log messages.
+
+    The file is read at most once per (path, mtime, size), so repeated yt-dlp
+    option setups with the same cookie file do not re-scan it.
+
+    Args:
+        cookie_path (str): Path to the cookie file
+
+    Returns:
+        tuple: (exists, size, keys) where keys lists the auth cookie names found
+    """
+    try:
+        st = os.stat(cookie_path)
+    except OSError:
+        return False, 0, []
+    return (
+        True,
+        st.st_size,
+        list(_scan_cookie_file_keys(cookie_path, st.st_mtime_ns, st.st_size)),
+    )
+
+
 def setup_ytdlp_cookies(
     ydl_opts: dict, cookie_manager, url: str, logger=None, context: str = ""
 ) -> None:
@@ -435,27 +521,8 @@ def setup_ytdlp_cookies(
                     # Log cookie file diagnostics if logger provided
                     if logger:
                         try:
-                            exists = os.path.exists(cookie_path)
-                            size = os.path.getsize(cookie_path) if exists else 0
-                            keys = []
+                            exists, size, keys = cookie_file_diagnostics(cookie_path)
                             if exists:
-                                with open(
-                                    cookie_path, encoding="utf-8", errors="ignore"
-                                ) as cf:
-                                    text = cf.read()
-                                for key in [
-                                    "__Secure-3PAPISID",
-                                    "__Secure-3PSID",
-                                    "SAPISID",
-                                    "APISID",
-                                    "SID",
-                                    "HSID",
-                                    "SSID",
-                                    "VISITOR_INFO1_LIVE",
-                                    "CONSENT",
-                                ]:
-                                    if key in text:
-                                        keys.append(key)
                                 prefix = f"[{context}] " if context else ""
                                 logger.log_info(
                                     f"{prefix}Using cookie file: {cookie_path} (exists={exists}, size={size}, keys={keys})"